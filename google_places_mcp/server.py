@@ -11,9 +11,22 @@ specifically designed for researching properties and their surrounding areas. It
 
 import os
 import json
-from typing import Optional, List, Dict, Any
+import asyncio
+import random
+import math
+import sqlite3
+import time
+import io
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, NamedTuple, AsyncIterator, Awaitable, Callable
 from enum import Enum
 import httpx
+from httpx._utils import get_environment_proxies
+from cachetools import TTLCache
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
@@ -21,8 +34,16 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    '''Close the shared HTTP client when the server shuts down.'''
+    try:
+        yield
+    finally:
+        await _close_client()
+
 # Initialize the MCP server
-mcp = FastMCP("google_places_mcp")
+mcp = FastMCP("google_places_mcp", lifespan=_lifespan)
 
 # Constants
 CHARACTER_LIMIT = 25000  # Maximum response size in characters
@@ -30,8 +51,118 @@ PLACES_API_BASE_URL = "https://places.googleapis.com/v1"
 ROUTES_API_BASE_URL = "https://routes.googleapis.com"
 GEOCODING_API_BASE_URL = "https://maps.googleapis.com/maps/api/geocode"
 
-# Get API key from environment
+# Get API key from environment (read once; tools only check the cached flag)
 API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
+_HAS_KEY = bool(API_KEY)
+_NO_KEY_ERR = "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+
+# Field masks for Places and Routes requests, built once at import
+_FIELD_MASK_NEARBY = "places.displayName,places.formattedAddress,places.rating,places.userRatingCount,places.location,places.id,places.nationalPhoneNumber,places.currentOpeningHours"
+_FIELD_MASK_TEXT = "places.displayName,places.formattedAddress,places.rating,places.userRatingCount,places.id,places.types,places.nationalPhoneNumber,places.websiteUri,places.location"
+_PLACE_FIELDS_BASE = ",".join((
+    "displayName",
+    "formattedAddress",
+    "rating",
+    "userRatingCount",
+    "nationalPhoneNumber",
+    "internationalPhoneNumber",
+    "websiteUri",
+    "googleMapsUri",
+    "types",
+    "location",
+    "viewport",
+    "currentOpeningHours",
+    "priceLevel",
+    "takeout",
+    "delivery",
+    "dineIn",
+    "servesBreakfast",
+    "servesLunch",
+    "servesDinner",
+    "servesBeer",
+    "servesWine",
+    "servesVegetarianFood",
+    "wheelchairAccessibleEntrance",
+    "wheelchairAccessibleParking",
+    "wheelchairAccessibleRestroom",
+    "wheelchairAccessibleSeating",
+    "parkingOptions",
+    "paymentOptions",
+    "goodForChildren",
+    "goodForGroups",
+    "allowsDogs"
+))
+_PLACE_FIELDS_WITH_REVIEWS = _PLACE_FIELDS_BASE + ",reviews"
+_FIELD_MASK_ROUTE = "routes.duration,routes.distanceMeters,routes.polyline,routes.legs.steps,routes.legs.localizedValues,routes.legs.distanceMeters,routes.legs.duration,routes.legs.staticDuration"
+_FIELD_MASK_MATRIX = "originIndex,destinationIndex,distanceMeters,duration,status,condition"
+
+# Per-request header and body fragments; never mutated, so every call shares them
+_HEADERS_NEARBY = {"X-Goog-FieldMask": _FIELD_MASK_NEARBY}
+_HEADERS_TEXT = {"X-Goog-FieldMask": _FIELD_MASK_TEXT}
+_HEADERS_DETAILS = {"X-Goog-FieldMask": _PLACE_FIELDS_BASE}
+_HEADERS_DETAILS_WITH_REVIEWS = {"X-Goog-FieldMask": _PLACE_FIELDS_WITH_REVIEWS}
+_HEADERS_ROUTE = {"X-Goog-FieldMask": _FIELD_MASK_ROUTE}
+_HEADERS_MATRIX = {"X-Goog-FieldMask": _FIELD_MASK_MATRIX}
+_ROUTE_MODIFIERS_DEFAULT = {
+    "avoidTolls": False,
+    "avoidHighways": False,
+    "avoidFerries": False
+}
+
+# (API field, display label) pairs for the place details markdown sections
+_FEATURE_MAP = (
+    ("takeout", "Takeout"),
+    ("delivery", "Delivery"),
+    ("dineIn", "Dine-in"),
+    ("servesBreakfast", "Breakfast"),
+    ("servesLunch", "Lunch"),
+    ("servesDinner", "Dinner"),
+    ("servesBeer", "Beer"),
+    ("servesWine", "Wine"),
+    ("servesVegetarianFood", "Vegetarian options"),
+    ("goodForChildren", "Good for children"),
+    ("goodForGroups", "Good for groups"),
+    ("allowsDogs", "Dogs allowed"),
+)
+_ACCESSIBILITY_MAP = (
+    ("wheelchairAccessibleEntrance", "Wheelchair accessible entrance"),
+    ("wheelchairAccessibleParking", "Wheelchair accessible parking"),
+    ("wheelchairAccessibleRestroom", "Wheelchair accessible restroom"),
+    ("wheelchairAccessibleSeating", "Wheelchair accessible seating"),
+)
+_PARKING_MAP = (
+    ("freeParking", "Free parking available"),
+    ("paidParkingLot", "Paid parking lot"),
+    ("paidStreetParking", "Paid street parking"),
+    ("valetParking", "Valet parking"),
+)
+_PAYMENT_MAP = (
+    ("creditCards", "Accepts credit cards"),
+    ("debitCards", "Accepts debit cards"),
+    ("cash", "Accepts cash"),
+    ("nfc", "Accepts NFC payments"),
+)
+
+# Batch nearby search limits
+MAX_BATCH_SEARCHES = 50  # Maximum location x place type combinations per batch call
+
+# Distance matrices larger than this are sent as concurrent one-origin requests
+MATRIX_SPLIT_MIN_ELEMENTS = 30  # Origin x destination pairs
+MATRIX_SPLIT_MIN_ORIGINS = 3
+
+# Outbound request limits shared by every tool
+GOOGLE_MAX_INFLIGHT = int(os.getenv("GOOGLE_MAX_INFLIGHT", "10"))  # Concurrent Google API requests
+MAX_RETRIES = 3  # Retries for rate-limited (429) or unavailable (5xx) responses
+MAX_RETRY_WAIT = 30.0  # Upper bound on a single wait, even if Retry-After asks for more
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Persistent geocode cache (set GEOCODE_CACHE_DIR to an empty string to disable)
+GEOCODE_CACHE_DIR = os.path.expanduser(os.getenv("GEOCODE_CACHE_DIR", "~/.cache/google_places_mcp"))
+GEOCODE_CACHE_TTL = 30 * 24 * 3600  # Google permits caching coordinates for up to 30 days
+
+# In-process cache of raw geocode and place details responses
+RESPONSE_CACHE_SIZE = 1024  # Entries per cache
+RESPONSE_CACHE_TTL = 3600  # Seconds
 
 # Enums
 class ResponseFormat(str, Enum):
@@ -39,6 +170,9 @@ class ResponseFormat(str, Enum):
     MARKDOWN = "markdown"
     JSON = "json"
 
+# Enum members are singletons and pydantic stores the member itself, so tools compare by identity
+_MARKDOWN = ResponseFormat.MARKDOWN
+
 class PlaceType(str, Enum):
     '''Common place types for nearby search.'''
     HOSPITAL = "hospital"
@@ -105,6 +239,43 @@ class NearbySearchInput(BaseModel):
         description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
     )
 
+class NearbyBatchSearchInput(BaseModel):
+    '''Input model for nearby place search around several locations at once.'''
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra='forbid'
+    )
+
+    locations: List[str] = Field(
+        ...,
+        description="Addresses or coordinates to search near (e.g., ['249 Holland Drive, Savannah, GA 31419', '32.0809,-81.0912']). Max 10.",
+        min_length=1,
+        max_length=10
+    )
+    place_types: List[str] = Field(
+        ...,
+        description="List of place types to search for around every location (e.g., ['hospital', 'hotel']). Same types as google_places_nearby_search.",
+        min_length=1,
+        max_length=10
+    )
+    radius_miles: Optional[float] = Field(
+        default=10.0,
+        description="Search radius in miles (default: 10.0)",
+        ge=0.1,
+        le=50.0
+    )
+    max_results: Optional[int] = Field(
+        default=20,
+        description="Maximum number of results per location and place type (default: 20, max: 20)",
+        ge=1,
+        le=20
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' or 'json'"
+    )
+
 class TextSearchInput(BaseModel):
     '''Input model for text-based place search.'''
     model_config = ConfigDict(
@@ -273,9 +444,197 @@ class ReverseGeocodeInput(BaseModel):
 
 # Shared utility functions
 
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    '''Return the shared HTTP client, creating it on first use.
+
+    Reusing one client keeps connections to the Google APIs alive between tool
+    calls, so only the first request pays for the TCP and TLS handshakes, and
+    HTTP/2 lets concurrent requests to the same host share one connection. Static
+    headers (content type and API key) live on the client so each request only
+    has to send its own field mask. Accept-Encoding is left to httpx, which
+    advertises gzip and, with the brotli extra installed, br, and decodes either
+    transparently. The transports retry failed connection attempts; HTTP-level
+    429/5xx retries are handled by _google_request.
+    '''
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            headers={
+                "Content-Type": "application/json",
+                "X-Goog-Api-Key": API_KEY
+            },
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=_make_transport(),
+            mounts=_proxy_mounts()
+        )
+    return _http_client
+
+def _make_transport(proxy: Optional[str] = None) -> httpx.AsyncHTTPTransport:
+    '''Build a transport with the shared pool settings and connect-level retries.'''
+    return httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        retries=2,
+        proxy=proxy
+    )
+
+def _proxy_mounts() -> Dict[str, Optional[httpx.AsyncHTTPTransport]]:
+    '''Mount a retrying transport for each proxy in HTTP(S)_PROXY / ALL_PROXY / NO_PROXY.
+
+    httpx only reads the proxy environment when no transport is passed, so the
+    map it would have built is rebuilt here. NO_PROXY entries map to None,
+    which sends those hosts through the default transport.
+    '''
+    return {
+        pattern: _make_transport(proxy) if proxy else None
+        for pattern, proxy in get_environment_proxies().items()
+    }
+
+async def _close_client() -> None:
+    '''Close the shared HTTP client; the next request opens a new one.'''
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
+_GOOGLE_SEM = asyncio.Semaphore(GOOGLE_MAX_INFLIGHT)
+
+# Keyed by normalized address, by (place_id, include_reviews) and by coordinates
+# rounded to 5 decimals (~1 m). Lookups and stores happen without an await in
+# between, so no lock is needed.
+_geocode_results: TTLCache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+_place_details: TTLCache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+_reverse_geocode_results: TTLCache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+# Fetches currently on the wire, by cache key, so concurrent misses share one request
+_inflight: Dict[Any, asyncio.Task] = {}
+
+def _retry_delay(attempt: int, response: httpx.Response) -> float:
+    '''Exponential backoff with jitter, waiting at least as long as a numeric Retry-After header.'''
+    delay = min(2 ** attempt, 8) + random.random()
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return min(delay, MAX_RETRY_WAIT)
+
+async def _google_request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    '''Send a request on the shared client, bounded by GOOGLE_MAX_INFLIGHT and retried on 429/5xx.
+
+    Raises httpx.HTTPStatusError once retries are exhausted or for any other error status.
+    '''
+    client = _get_client()
+    for attempt in range(MAX_RETRIES + 1):
+        async with _GOOGLE_SEM:
+            response = await client.request(method, url, **kwargs)
+        if response.status_code not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(_retry_delay(attempt, response))
+    response.raise_for_status()
+    return response
+
+async def _google_stream_json_lines(method: str, url: str, **kwargs: Any) -> AsyncIterator[Any]:
+    '''Stream a JSON-L response from the shared client, yielding each parsed line as it arrives.
+
+    Uses the same concurrency bound and 429/5xx retry policy as _google_request;
+    retries only happen before the first line is yielded.
+    '''
+    client = _get_client()
+    for attempt in range(MAX_RETRIES + 1):
+        async with _GOOGLE_SEM:
+            async with client.stream(method, url, **kwargs) as response:
+                if response.status_code in _RETRY_STATUSES and attempt < MAX_RETRIES:
+                    delay = _retry_delay(attempt, response)
+                else:
+                    if response.is_error:
+                        await response.aread()  # Error handling reads the body
+                        response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if line.strip():
+                            yield _json_loads(line)
+                    return
+        await asyncio.sleep(delay)
+
+async def _single_flight(key: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    '''Run fetch() once per key at a time; concurrent callers with the same key await its result.
+
+    The fetch runs as its own task and every caller, the first included, awaits
+    it through a shield, so a cancelled caller never cancels the shared fetch
+    for the others. Exceptions propagate to every caller.
+    '''
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+
+        def _done(t: asyncio.Task) -> None:
+            _inflight.pop(key, None)
+            if not t.cancelled():
+                t.exception()  # Mark retrieved in case every caller was cancelled
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
+def _json_loads(data: Any) -> Any:
+    '''Parse JSON from bytes or str, using orjson when it is installed.'''
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj: Any) -> str:
+    '''Serialize a tool response as indented JSON, using orjson when it is installed.'''
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def _json_dumps_capped(obj: Any, truncation_note: str) -> str:
+    '''Serialize like _json_dumps, truncating to CHARACTER_LIMIT with the given note.
+
+    With orjson the limit is first checked on the encoded bytes. UTF-8 never has
+    fewer bytes than characters, so a payload that fits is decoded exactly once.
+    '''
+    if orjson:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        if len(data) <= CHARACTER_LIMIT:
+            return data.decode()
+        text = data.decode()
+    else:
+        text = json.dumps(obj, indent=2)
+    if len(text) > CHARACTER_LIMIT:
+        text = text[:CHARACTER_LIMIT - len(truncation_note)] + truncation_note
+    return text
+
+class _CappedBuffer:
+    '''StringIO that stops growing once the text passes CHARACTER_LIMIT.
+
+    On overflow the buffer is cut back in place to leave room for the truncation
+    note, which is appended, and every later write is dropped. The result matches
+    slicing the full text, without building the full text first.
+    '''
+    __slots__ = ("_buf", "_written", "_note", "truncated")
+
+    def __init__(self, truncation_note: str):
+        self._buf = io.StringIO()
+        self._written = 0
+        self._note = truncation_note
+        self.truncated = False
+
+    def write(self, text: str) -> None:
+        if self.truncated:
+            return
+        self._written += len(text)
+        self._buf.write(text)
+        if self._written > CHARACTER_LIMIT:
+            self._buf.seek(CHARACTER_LIMIT - len(self._note))
+            self._buf.truncate()
+            self._buf.write(self._note)
+            self.truncated = True
+
+    def getvalue(self) -> str:
+        return self._buf.getvalue()
+
 def _check_api_key() -> bool:
     '''Check if API key is configured.'''
-    return bool(API_KEY and API_KEY != "")
+    return _HAS_KEY
 
 def _handle_api_error(e: Exception) -> str:
     '''Consistent error formatting across all tools.'''
@@ -302,6 +661,61 @@ def _handle_api_error(e: Exception) -> str:
         return "Error: Could not connect to Google Maps API. Please check your internet connection."
     return f"Error: Unexpected error occurred: {type(e).__name__} - {str(e)}"
 
+_geocode_cache: Optional[sqlite3.Connection] = None
+_geocode_cache_opened = False
+
+def _get_geocode_cache() -> Optional[sqlite3.Connection]:
+    '''Open the on-disk geocode cache on first use; returns None if it is disabled or unavailable.'''
+    global _geocode_cache, _geocode_cache_opened
+    if not _geocode_cache_opened:
+        _geocode_cache_opened = True
+        if GEOCODE_CACHE_DIR:
+            try:
+                os.makedirs(GEOCODE_CACHE_DIR, exist_ok=True)
+                conn = sqlite3.connect(
+                    os.path.join(GEOCODE_CACHE_DIR, "geocode.db"),
+                    isolation_level=None,
+                    check_same_thread=False
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS geocode "
+                    "(key TEXT PRIMARY KEY, latitude REAL NOT NULL, longitude REAL NOT NULL, ts REAL NOT NULL)"
+                )
+                _geocode_cache = conn
+            except (OSError, sqlite3.Error):
+                _geocode_cache = None
+    return _geocode_cache
+
+def _geocode_cache_get(key: str) -> Optional[Dict[str, float]]:
+    '''Return cached coordinates for a location key if present and still fresh.'''
+    cache = _get_geocode_cache()
+    if cache is None:
+        return None
+    try:
+        row = cache.execute(
+            "SELECT latitude, longitude FROM geocode WHERE key = ? AND ts > ?",
+            (key, time.time() - GEOCODE_CACHE_TTL)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    return {"latitude": row[0], "longitude": row[1]}
+
+def _geocode_cache_set(key: str, coords: Dict[str, float]) -> None:
+    '''Store coordinates for a location key; cache failures are never fatal.'''
+    cache = _get_geocode_cache()
+    if cache is None:
+        return
+    try:
+        cache.execute(
+            "INSERT OR REPLACE INTO geocode (key, latitude, longitude, ts) VALUES (?, ?, ?, ?)",
+            (key, coords["latitude"], coords["longitude"], time.time())
+        )
+    except sqlite3.Error:
+        pass
+
 async def _geocode_location(location: str) -> Optional[Dict[str, float]]:
     '''Helper function to geocode a location string to coordinates.'''
     # Check if already coordinates
@@ -316,19 +730,25 @@ async def _geocode_location(location: str) -> Optional[Dict[str, float]]:
         except ValueError:
             pass
 
+    # Serve repeat addresses from the persistent cache
+    cache_key = location.strip().lower()
+    cached = _geocode_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     # Geocode the address
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{GEOCODING_API_BASE_URL}/json",
-            params={"address": location, "key": API_KEY},
-            timeout=30.0
-        )
-        response.raise_for_status()
-        data = response.json()
+    response = await _google_request(
+        "GET",
+        f"{GEOCODING_API_BASE_URL}/json",
+        params={"address": location, "key": API_KEY}
+    )
+    data = _json_loads(response.content)
 
-        if data.get("status") == "OK" and data.get("results"):
-            coords = data["results"][0]["geometry"]["location"]
-            return {"latitude": coords["lat"], "longitude": coords["lng"]}
+    if data.get("status") == "OK" and data.get("results"):
+        coords = data["results"][0]["geometry"]["location"]
+        result = {"latitude": coords["lat"], "longitude": coords["lng"]}
+        _geocode_cache_set(cache_key, result)
+        return result
 
     return None
 
@@ -336,6 +756,10 @@ def _meters_to_miles(meters: float) -> float:
     '''Convert meters to miles.'''
     return meters * 0.000621371
 
+def _parse_google_seconds(value: Optional[str]) -> int:
+    '''Convert a Routes API duration string such as "123s" to whole seconds.'''
+    return int(value[:-1]) if value else 0
+
 def _format_duration(seconds: int) -> str:
     '''Format duration in seconds to human-readable format.'''
     hours = seconds // 3600
@@ -344,6 +768,156 @@ def _format_duration(seconds: int) -> str:
         return f"{hours}h {minutes}m"
     return f"{minutes}m"
 
+class _NearbyPlace(NamedTuple):
+    '''One nearby search result; converted to a dict only when JSON output is requested.'''
+    name: str
+    address: str
+    rating: Optional[float]
+    user_ratings_total: int
+    distance_miles: float
+    place_id: str
+    phone: Optional[str]
+    open_now: Optional[bool]
+
+async def _search_nearby_type(
+    coords: Dict[str, float],
+    place_type: str,
+    radius_meters: float,
+    max_results: int
+) -> List[_NearbyPlace]:
+    '''Run one Places nearby search for a single type around coords and return the simplified places.'''
+    request_body = {
+        "includedTypes": [place_type],
+        "maxResultCount": max_results,
+        "locationRestriction": {
+            "circle": {
+                "center": {
+                    "latitude": coords["latitude"],
+                    "longitude": coords["longitude"]
+                },
+                "radius": radius_meters
+            }
+        }
+    }
+
+    response = await _google_request(
+        "POST",
+        f"{PLACES_API_BASE_URL}/places:searchNearby",
+        headers=_HEADERS_NEARBY,
+        json=request_body
+    )
+    data = _json_loads(response.content)
+
+    # Origin terms of the Haversine formula are constant for the whole search
+    origin_lat = math.radians(coords["latitude"])
+    origin_lng = math.radians(coords["longitude"])
+    cos_origin_lat = math.cos(origin_lat)
+
+    type_results = []
+    for place in data.get("places", []):
+        # Look up each nested object once
+        location = place.get("location") or {}
+        display_name = place.get("displayName") or {}
+        opening_hours = place.get("currentOpeningHours") or {}
+
+        # Calculate distance using Haversine formula approximation
+        lat2 = math.radians(location.get("latitude", 0))
+        lng2 = math.radians(location.get("longitude", 0))
+        a = math.sin((lat2 - origin_lat) / 2) ** 2 + cos_origin_lat * math.cos(lat2) * math.sin((lng2 - origin_lng) / 2) ** 2
+        distance_miles = 3959 * 2 * math.asin(math.sqrt(a))  # Earth radius in miles
+
+        type_results.append(_NearbyPlace(
+            name=display_name.get("text", "Unknown"),
+            address=place.get("formattedAddress", "N/A"),
+            rating=place.get("rating"),
+            user_ratings_total=place.get("userRatingCount", 0),
+            distance_miles=round(distance_miles, 2),
+            place_id=place.get("id", "").replace("places/", ""),
+            phone=place.get("nationalPhoneNumber"),
+            open_now=opening_hours.get("openNow")
+        ))
+    return type_results
+
+def _nearby_results_json(results_by_type: Dict[str, List[_NearbyPlace]]) -> Dict[str, List[Dict[str, Any]]]:
+    '''Convert nearby rows to the JSON response shape.'''
+    return {
+        place_type: [place._asdict() for place in places]
+        for place_type, places in results_by_type.items()
+    }
+
+def _append_nearby_section(lines: List[str], place_type: str, places: List[_NearbyPlace], heading: str = "##") -> None:
+    '''Append the markdown section for one place type; places get one heading level deeper.'''
+    title = place_type.replace('_', ' ').title()
+    if not places:
+        lines.append(f"{heading} {title} (0 results)")
+        lines.append("No places found of this type.")
+        lines.append("")
+        return
+
+    lines.append(f"{heading} {title} ({len(places)} results)")
+    lines.append("")
+
+    for place in places:
+        rating_str = f"⭐ {place.rating}" if place.rating else "No rating"
+        lines.append(f"{heading}# {place.name} {rating_str}")
+        lines.append(f"- **Address**: {place.address}")
+        lines.append(f"- **Distance**: {place.distance_miles} miles")
+        if place.phone:
+            lines.append(f"- **Phone**: {place.phone}")
+        if place.open_now is not None:
+            status = "Open now" if place.open_now else "Closed"
+            lines.append(f"- **Status**: {status}")
+        if place.user_ratings_total:
+            lines.append(f"- **Reviews**: {place.user_ratings_total} ratings")
+        lines.append(f"- **Place ID**: {place.place_id}")
+        lines.append("")
+
+async def _compute_matrix_rows(
+    origins: List[str],
+    destinations: List[str],
+    travel_mode: str
+) -> AsyncIterator[Dict[str, Any]]:
+    '''Yield computeRouteMatrix elements for the given origins and destinations.
+
+    Small matrices are one streamed request. Large ones are split into one request
+    per origin, run concurrently on the shared client, with originIndex rewritten
+    to the origin's position in the full list.
+    '''
+    url = f"{ROUTES_API_BASE_URL}/distanceMatrix/v2:computeRouteMatrix"
+    headers = _HEADERS_MATRIX
+    destination_waypoints = [{"address": dest} for dest in destinations]
+
+    if len(origins) * len(destinations) <= MATRIX_SPLIT_MIN_ELEMENTS or len(origins) <= MATRIX_SPLIT_MIN_ORIGINS:
+        request_body = {
+            "origins": [{"address": origin} for origin in origins],
+            "destinations": destination_waypoints,
+            "travelMode": travel_mode
+        }
+        async for row in _google_stream_json_lines(
+            "POST", url, headers=headers, json=request_body,
+            timeout=60.0  # Longer timeout for matrix calculations
+        ):
+            yield row
+        return
+
+    async def _origin_rows(origin_idx: int, origin: str) -> List[Dict[str, Any]]:
+        request_body = {
+            "origins": [{"address": origin}],
+            "destinations": destination_waypoints,
+            "travelMode": travel_mode
+        }
+        rows = []
+        async for row in _google_stream_json_lines(
+            "POST", url, headers=headers, json=request_body, timeout=60.0
+        ):
+            row["originIndex"] = origin_idx
+            rows.append(row)
+        return rows
+
+    for rows in await asyncio.gather(*(_origin_rows(i, origin) for i, origin in enumerate(origins))):
+        for row in rows:
+            yield row
+
 # Tool implementations
 
 @mcp.tool(
@@ -427,7 +1001,7 @@ async def google_places_nearby_search(params: NearbySearchInput) -> str:
         - Returns formatted results or "No places found" message
     '''
     if not _check_api_key():
-        return "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+        return _NO_KEY_ERR
 
     try:
         # Geocode the location
@@ -437,70 +1011,16 @@ async def google_places_nearby_search(params: NearbySearchInput) -> str:
 
         radius_meters = params.radius_miles * 1609.34  # Convert miles to meters
 
-        results_by_type = {}
-        total_count = 0
-
-        # Search for each place type
-        for place_type in params.place_types:
-            async with httpx.AsyncClient() as client:
-                request_body = {
-                    "includedTypes": [place_type],
-                    "maxResultCount": params.max_results,
-                    "locationRestriction": {
-                        "circle": {
-                            "center": {
-                                "latitude": coords["latitude"],
-                                "longitude": coords["longitude"]
-                            },
-                            "radius": radius_meters
-                        }
-                    }
-                }
-
-                response = await client.post(
-                    f"{PLACES_API_BASE_URL}/places:searchNearby",
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-Goog-Api-Key": API_KEY,
-                        "X-Goog-FieldMask": "places.displayName,places.formattedAddress,places.rating,places.userRatingCount,places.location,places.id,places.nationalPhoneNumber,places.currentOpeningHours"
-                    },
-                    json=request_body,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                places = data.get("places", [])
-                results_by_type[place_type] = []
-
-                for place in places:
-                    place_lat = place.get("location", {}).get("latitude", 0)
-                    place_lng = place.get("location", {}).get("longitude", 0)
-
-                    # Calculate distance using Haversine formula approximation
-                    import math
-                    lat1, lon1 = math.radians(coords["latitude"]), math.radians(coords["longitude"])
-                    lat2, lon2 = math.radians(place_lat), math.radians(place_lng)
-                    dlat, dlon = lat2 - lat1, lon2 - lon1
-                    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-                    c = 2 * math.asin(math.sqrt(a))
-                    distance_miles = 3959 * c  # Earth radius in miles
-
-                    place_data = {
-                        "name": place.get("displayName", {}).get("text", "Unknown"),
-                        "address": place.get("formattedAddress", "N/A"),
-                        "rating": place.get("rating"),
-                        "user_ratings_total": place.get("userRatingCount", 0),
-                        "distance_miles": round(distance_miles, 2),
-                        "place_id": place.get("id", "").replace("places/", ""),
-                        "phone": place.get("nationalPhoneNumber"),
-                        "open_now": place.get("currentOpeningHours", {}).get("openNow")
-                    }
-                    results_by_type[place_type].append(place_data)
-                    total_count += 1
+        # Search for all place types concurrently
+        type_results = await asyncio.gather(*[
+            _search_nearby_type(coords, place_type, radius_meters, params.max_results)
+            for place_type in params.place_types
+        ])
+        results_by_type = dict(zip(params.place_types, type_results))
+        total_count = sum(len(places) for places in type_results)
 
         # Format response
-        if params.response_format == ResponseFormat.MARKDOWN:
+        if params.response_format is _MARKDOWN:
             lines = [
                 f"# Nearby Places: {params.location}",
                 f"Search radius: {params.radius_miles} miles",
@@ -509,38 +1029,17 @@ async def google_places_nearby_search(params: NearbySearchInput) -> str:
             ]
 
             for place_type, places in results_by_type.items():
-                if places:
-                    lines.append(f"## {place_type.replace('_', ' ').title()} ({len(places)} results)")
-                    lines.append("")
-
-                    for place in places:
-                        rating_str = f"⭐ {place['rating']}" if place['rating'] else "No rating"
-                        lines.append(f"### {place['name']} {rating_str}")
-                        lines.append(f"- **Address**: {place['address']}")
-                        lines.append(f"- **Distance**: {place['distance_miles']} miles")
-                        if place['phone']:
-                            lines.append(f"- **Phone**: {place['phone']}")
-                        if place['open_now'] is not None:
-                            status = "Open now" if place['open_now'] else "Closed"
-                            lines.append(f"- **Status**: {status}")
-                        if place['user_ratings_total']:
-                            lines.append(f"- **Reviews**: {place['user_ratings_total']} ratings")
-                        lines.append(f"- **Place ID**: {place['place_id']}")
-                        lines.append("")
-                else:
-                    lines.append(f"## {place_type.replace('_', ' ').title()} (0 results)")
-                    lines.append("No places found of this type.")
-                    lines.append("")
+                _append_nearby_section(lines, place_type, places)
 
             result = "\n".join(lines)
         else:
-            result = json.dumps({
+            result = _json_dumps({
                 "search_location": params.location,
                 "search_coordinates": coords,
                 "radius_miles": params.radius_miles,
-                "results_by_type": results_by_type,
+                "results_by_type": _nearby_results_json(results_by_type),
                 "total_results": total_count
-            }, indent=2)
+            })
 
         # Check character limit
         if len(result) > CHARACTER_LIMIT:
@@ -552,6 +1051,152 @@ async def google_places_nearby_search(params: NearbySearchInput) -> str:
     except Exception as e:
         return _handle_api_error(e)
 
+@mcp.tool(
+    name="google_places_nearby_batch_search",
+    annotations={
+        "title": "Search for Nearby Places Around Several Locations",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def google_places_nearby_batch_search(params: NearbyBatchSearchInput) -> str:
+    '''
+    Search for places by type around several locations in a single call.
+
+    This tool runs the same search as google_places_nearby_search for every combination of
+    location and place type, issuing the Google requests concurrently. Use it to compare
+    the surroundings of several candidate properties without calling the tool repeatedly.
+
+    Args:
+        params (NearbyBatchSearchInput): Validated input parameters containing:
+            - locations (List[str]): Addresses or coordinates to search near (max 10)
+            - place_types (List[str]): Place types to find around each location (max 10)
+            - radius_miles (Optional[float]): Search radius in miles (default: 10.0, max: 50.0)
+            - max_results (Optional[int]): Results per location and place type (default: 20, max: 20)
+            - response_format (ResponseFormat): Output format ('markdown' or 'json')
+
+    Returns:
+        str: Formatted results grouped by location, then by place type
+
+        Success response (markdown):
+            # Nearby Places: X locations
+            Search radius: X miles
+
+            ## [location]
+            ### [Place Type] (X results)
+            #### [Place Name] ⭐ X.X
+            - **Address**: [full address]
+            - **Distance**: X.X miles
+
+        Success response (json):
+            {
+                "radius_miles": float,
+                "results_by_location": [
+                    {
+                        "search_location": str,
+                        "search_coordinates": {"latitude": float, "longitude": float},
+                        "results_by_type": {"[place_type]": [...]},
+                        "total_results": int
+                    }
+                ],
+                "total_results": int
+            }
+
+        Error response:
+            "Error: [error message]"
+
+    Examples:
+        - Use when: "Compare hospitals and pharmacies near these three properties"
+        - Use when: "Find parks within 5 miles of each candidate address"
+        - Don't use when: Searching around a single location (use google_places_nearby_search)
+
+    Error Handling:
+        - Returns "Error: API key not configured" if GOOGLE_MAPS_API_KEY not set
+        - Returns "Error: Too many searches" if locations x place_types exceeds 50
+        - Locations that cannot be geocoded are reported individually
+    '''
+    if not _check_api_key():
+        return _NO_KEY_ERR
+
+    try:
+        if len(params.locations) * len(params.place_types) > MAX_BATCH_SEARCHES:
+            return f"Error: Too many searches (max {MAX_BATCH_SEARCHES} location/place type combinations). Reduce the number of locations or place types."
+
+        radius_meters = params.radius_miles * 1609.34  # Convert miles to meters
+
+        # Geocode every location concurrently, then fan out over (location, place type)
+        centers = await asyncio.gather(*[_geocode_location(loc) for loc in params.locations])
+
+        # _google_request keeps the number of requests in flight bounded
+        pairs = [
+            (index, place_type)
+            for index, coords in enumerate(centers) if coords
+            for place_type in params.place_types
+        ]
+        type_results = await asyncio.gather(*[
+            _search_nearby_type(centers[index], place_type, radius_meters, params.max_results)
+            for index, place_type in pairs
+        ])
+
+        results_by_location = [{} for _ in params.locations]
+        for (index, place_type), places in zip(pairs, type_results):
+            results_by_location[index][place_type] = places
+        total_count = sum(len(places) for places in type_results)
+
+        # Format response
+        if params.response_format is _MARKDOWN:
+            lines = [
+                f"# Nearby Places: {len(params.locations)} locations",
+                f"Search radius: {params.radius_miles} miles",
+                f"Total results: {total_count}",
+                ""
+            ]
+
+            for location, coords, results_by_type in zip(params.locations, centers, results_by_location):
+                lines.append(f"## {location}")
+                lines.append("")
+                if not coords:
+                    lines.append("Could not geocode this location. Please provide a valid address or coordinates.")
+                    lines.append("")
+                    continue
+                for place_type, places in results_by_type.items():
+                    _append_nearby_section(lines, place_type, places, heading="###")
+
+            result = "\n".join(lines)
+        else:
+            locations_data = []
+            for location, coords, results_by_type in zip(params.locations, centers, results_by_location):
+                if not coords:
+                    locations_data.append({
+                        "search_location": location,
+                        "error": "Could not geocode location"
+                    })
+                    continue
+                locations_data.append({
+                    "search_location": location,
+                    "search_coordinates": coords,
+                    "results_by_type": _nearby_results_json(results_by_type),
+                    "total_results": sum(len(places) for places in results_by_type.values())
+                })
+
+            result = _json_dumps({
+                "radius_miles": params.radius_miles,
+                "results_by_location": locations_data,
+                "total_results": total_count
+            })
+
+        # Check character limit
+        if len(result) > CHARACTER_LIMIT:
+            truncation_note = f"\n\n[Response truncated - exceeded {CHARACTER_LIMIT} character limit. Try fewer locations, reducing radius_miles or max_results.]"
+            result = result[:CHARACTER_LIMIT - len(truncation_note)] + truncation_note
+
+        return result
+
+    except Exception as e:
+        return _handle_api_error(e)
+
 @mcp.tool(
     name="google_places_text_search",
     annotations={
@@ -626,7 +1271,7 @@ async def google_places_text_search(params: TextSearchInput) -> str:
         - Returns formatted results or error message
     '''
     if not _check_api_key():
-        return "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+        return _NO_KEY_ERR
 
     try:
         request_body = {
@@ -648,19 +1293,13 @@ async def google_places_text_search(params: TextSearchInput) -> str:
                     }
                 }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{PLACES_API_BASE_URL}/places:searchText",
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Goog-Api-Key": API_KEY,
-                    "X-Goog-FieldMask": "places.displayName,places.formattedAddress,places.rating,places.userRatingCount,places.id,places.types,places.nationalPhoneNumber,places.websiteUri,places.location"
-                },
-                json=request_body,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await _google_request(
+            "POST",
+            f"{PLACES_API_BASE_URL}/places:searchText",
+            headers=_HEADERS_TEXT,
+            json=request_body
+        )
+        data = _json_loads(response.content)
 
         places = data.get("places", [])
 
@@ -669,8 +1308,9 @@ async def google_places_text_search(params: TextSearchInput) -> str:
 
         results = []
         for place in places:
-            place_data = {
-                "name": place.get("displayName", {}).get("text", "Unknown"),
+            location = place.get("location") or {}
+            results.append({
+                "name": (place.get("displayName") or {}).get("text", "Unknown"),
                 "address": place.get("formattedAddress", "N/A"),
                 "rating": place.get("rating"),
                 "user_ratings_total": place.get("userRatingCount", 0),
@@ -679,14 +1319,13 @@ async def google_places_text_search(params: TextSearchInput) -> str:
                 "phone": place.get("nationalPhoneNumber"),
                 "website": place.get("websiteUri"),
                 "coordinates": {
-                    "latitude": place.get("location", {}).get("latitude"),
-                    "longitude": place.get("location", {}).get("longitude")
+                    "latitude": location.get("latitude"),
+                    "longitude": location.get("longitude")
                 }
-            }
-            results.append(place_data)
+            })
 
         # Format response
-        if params.response_format == ResponseFormat.MARKDOWN:
+        if params.response_format is _MARKDOWN:
             lines = [
                 f"# Search Results: \"{params.query}\"",
                 f"Found {len(results)} results",
@@ -713,11 +1352,11 @@ async def google_places_text_search(params: TextSearchInput) -> str:
 
             result = "\n".join(lines)
         else:
-            result = json.dumps({
+            result = _json_dumps({
                 "query": params.query,
                 "results": results,
                 "total_results": len(results)
-            }, indent=2)
+            })
 
         # Check character limit
         if len(result) > CHARACTER_LIMIT:
@@ -792,182 +1431,126 @@ async def google_places_get_details(params: PlaceDetailsInput) -> str:
         - Returns formatted details or error message
     '''
     if not _check_api_key():
-        return "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+        return _NO_KEY_ERR
 
     try:
-        # Build field mask for comprehensive details
-        field_mask_parts = [
-            "displayName",
-            "formattedAddress",
-            "rating",
-            "userRatingCount",
-            "nationalPhoneNumber",
-            "internationalPhoneNumber",
-            "websiteUri",
-            "googleMapsUri",
-            "types",
-            "location",
-            "viewport",
-            "currentOpeningHours",
-            "priceLevel",
-            "takeout",
-            "delivery",
-            "dineIn",
-            "servesBreakfast",
-            "servesLunch",
-            "servesDinner",
-            "servesBeer",
-            "servesWine",
-            "servesVegetarianFood",
-            "wheelchairAccessibleEntrance",
-            "wheelchairAccessibleParking",
-            "wheelchairAccessibleRestroom",
-            "wheelchairAccessibleSeating",
-            "parkingOptions",
-            "paymentOptions",
-            "goodForChildren",
-            "goodForGroups",
-            "allowsDogs"
-        ]
-
-        if params.include_reviews:
-            field_mask_parts.append("reviews")
-
-        field_mask = ",".join(field_mask_parts)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        cache_key = (params.place_id, params.include_reviews)
+        place = _place_details.get(cache_key)
+        if place is None:
+            response = await _google_request(
+                "GET",
                 f"{PLACES_API_BASE_URL}/places/{params.place_id}",
-                headers={
-                    "X-Goog-Api-Key": API_KEY,
-                    "X-Goog-FieldMask": field_mask
-                },
-                timeout=30.0
+                headers=_HEADERS_DETAILS_WITH_REVIEWS if params.include_reviews else _HEADERS_DETAILS
             )
-            response.raise_for_status()
-            place = response.json()
+            place = _json_loads(response.content)
+            _place_details[cache_key] = place
 
         # Format response
-        if params.response_format == ResponseFormat.MARKDOWN:
-            lines = []
+        truncation_note = f"\n\n[Response truncated - exceeded {CHARACTER_LIMIT} character limit. Try setting include_reviews=False or reducing max_reviews.]"
+        if params.response_format is _MARKDOWN:
+            buf = _CappedBuffer(truncation_note)
+            w = buf.write
 
             # Header
             name = place.get("displayName", {}).get("text", "Unknown Place")
             rating = place.get("rating")
             review_count = place.get("userRatingCount", 0)
 
-            lines.append(f"# {name}")
+            w(f"# {name}")
             if rating:
-                lines.append(f"⭐ {rating} rating ({review_count:,} reviews)")
-            lines.append("")
+                w(f"\n⭐ {rating} rating ({review_count:,} reviews)")
+            w("\n")
 
             # Basic Information
-            lines.append("## Basic Information")
-            lines.append(f"- **Address**: {place.get('formattedAddress', 'N/A')}")
+            w("\n## Basic Information")
+            w(f"\n- **Address**: {place.get('formattedAddress', 'N/A')}")
 
             if place.get("nationalPhoneNumber"):
-                lines.append(f"- **Phone**: {place['nationalPhoneNumber']}")
+                w(f"\n- **Phone**: {place['nationalPhoneNumber']}")
             if place.get("websiteUri"):
-                lines.append(f"- **Website**: {place['websiteUri']}")
+                w(f"\n- **Website**: {place['websiteUri']}")
             if place.get("googleMapsUri"):
-                lines.append(f"- **Google Maps**: {place['googleMapsUri']}")
+                w(f"\n- **Google Maps**: {place['googleMapsUri']}")
 
             types = place.get("types", [])
             if types:
                 primary_type = types[0].replace('_', ' ').title()
-                lines.append(f"- **Type**: {primary_type}")
+                w(f"\n- **Type**: {primary_type}")
 
             price_level = place.get("priceLevel")
             if price_level:
-                lines.append(f"- **Price Level**: {'$' * price_level}")
+                w(f"\n- **Price Level**: {'$' * price_level}")
 
             coords = place.get("location", {})
             if coords.get("latitude"):
-                lines.append(f"- **Coordinates**: {coords['latitude']}, {coords['longitude']}")
+                w(f"\n- **Coordinates**: {coords['latitude']}, {coords['longitude']}")
 
-            lines.append("")
+            w("\n")
 
             # Opening Hours
             hours = place.get("currentOpeningHours", {})
             if hours:
-                lines.append("## Hours")
+                w("\n## Hours")
                 weekday_texts = hours.get("weekdayDescriptions", [])
                 for day_hours in weekday_texts:
-                    lines.append(f"- {day_hours}")
-                lines.append("")
+                    w(f"\n- {day_hours}")
+                w("\n")
 
             # Features & Amenities
-            features = []
-            if place.get("takeout"): features.append("Takeout")
-            if place.get("delivery"): features.append("Delivery")
-            if place.get("dineIn"): features.append("Dine-in")
-            if place.get("servesBreakfast"): features.append("Breakfast")
-            if place.get("servesLunch"): features.append("Lunch")
-            if place.get("servesDinner"): features.append("Dinner")
-            if place.get("servesBeer"): features.append("Beer")
-            if place.get("servesWine"): features.append("Wine")
-            if place.get("servesVegetarianFood"): features.append("Vegetarian options")
-            if place.get("goodForChildren"): features.append("Good for children")
-            if place.get("goodForGroups"): features.append("Good for groups")
-            if place.get("allowsDogs"): features.append("Dogs allowed")
+            features = [label for key, label in _FEATURE_MAP if place.get(key)]
 
             if features:
-                lines.append("## Features & Amenities")
-                lines.append(f"- {', '.join(features)}")
-                lines.append("")
+                w("\n## Features & Amenities")
+                w(f"\n- {', '.join(features)}")
+                w("\n")
 
             # Accessibility
-            accessibility = []
-            if place.get("wheelchairAccessibleEntrance"): accessibility.append("Wheelchair accessible entrance")
-            if place.get("wheelchairAccessibleParking"): accessibility.append("Wheelchair accessible parking")
-            if place.get("wheelchairAccessibleRestroom"): accessibility.append("Wheelchair accessible restroom")
-            if place.get("wheelchairAccessibleSeating"): accessibility.append("Wheelchair accessible seating")
+            accessibility = [label for key, label in _ACCESSIBILITY_MAP if place.get(key)]
 
             if accessibility:
-                lines.append("## Accessibility")
+                w("\n## Accessibility")
                 for item in accessibility:
-                    lines.append(f"- {item}")
-                lines.append("")
+                    w(f"\n- {item}")
+                w("\n")
 
             # Parking & Payment
             parking = place.get("parkingOptions", {})
             payment = place.get("paymentOptions", {})
 
             if parking or payment:
-                lines.append("## Parking & Payment")
-                if parking.get("freeParking"): lines.append("- Free parking available")
-                if parking.get("paidParkingLot"): lines.append("- Paid parking lot")
-                if parking.get("paidStreetParking"): lines.append("- Paid street parking")
-                if parking.get("valetParking"): lines.append("- Valet parking")
-
-                if payment.get("creditCards"): lines.append("- Accepts credit cards")
-                if payment.get("debitCards"): lines.append("- Accepts debit cards")
-                if payment.get("cash"): lines.append("- Accepts cash")
-                if payment.get("nfc"): lines.append("- Accepts NFC payments")
-                lines.append("")
+                w("\n## Parking & Payment")
+                for key, label in _PARKING_MAP:
+                    if parking.get(key):
+                        w(f"\n- {label}")
+                for key, label in _PAYMENT_MAP:
+                    if payment.get(key):
+                        w(f"\n- {label}")
+                w("\n")
 
             # Reviews
             if params.include_reviews:
                 reviews = place.get("reviews", [])
                 if reviews:
-                    lines.append(f"## Recent Reviews (showing {min(len(reviews), params.max_reviews)} of {review_count:,})")
-                    lines.append("")
+                    w(f"\n## Recent Reviews (showing {min(len(reviews), params.max_reviews)} of {review_count:,})")
+                    w("\n")
 
                     for review in reviews[:params.max_reviews]:
+                        if buf.truncated:
+                            break
                         author = review.get("authorAttribution", {}).get("displayName", "Anonymous")
                         rating_val = review.get("rating", 0)
                         rel_time = review.get("relativePublishTimeDescription", "")
                         text = review.get("text", {}).get("text", "")
 
-                        lines.append(f"### ⭐ {rating_val} - {author} ({rel_time})")
+                        w(f"\n### ⭐ {rating_val} - {author} ({rel_time})")
                         if text:
                             # Truncate long reviews
                             if len(text) > 500:
                                 text = text[:500] + "..."
-                            lines.append(text)
-                        lines.append("")
+                            w("\n" + text)
+                        w("\n")
 
-            result = "\n".join(lines)
+            result = buf.getvalue()
         else:
             # JSON format - return structured data
             result_data = {
@@ -1012,12 +1595,7 @@ async def google_places_get_details(params: PlaceDetailsInput) -> str:
                     for r in reviews[:params.max_reviews]
                 ]
 
-            result = json.dumps(result_data, indent=2)
-
-        # Check character limit
-        if len(result) > CHARACTER_LIMIT:
-            truncation_note = f"\n\n[Response truncated - exceeded {CHARACTER_LIMIT} character limit. Try setting include_reviews=False or reducing max_reviews.]"
-            result = result[:CHARACTER_LIMIT - len(truncation_note)] + truncation_note
+            result = _json_dumps_capped(result_data, truncation_note)
 
         return result
 
@@ -1096,7 +1674,7 @@ async def google_routes_compute_route(params: ComputeRouteInput) -> str:
         - Returns formatted route info or error message
     '''
     if not _check_api_key():
-        return "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+        return _NO_KEY_ERR
 
     try:
         request_body = {
@@ -1104,11 +1682,7 @@ async def google_routes_compute_route(params: ComputeRouteInput) -> str:
             "destination": {"address": params.destination},
             "travelMode": params.travel_mode.value,
             "computeAlternativeRoutes": False,
-            "routeModifiers": {
-                "avoidTolls": False,
-                "avoidHighways": False,
-                "avoidFerries": False
-            },
+            "routeModifiers": _ROUTE_MODIFIERS_DEFAULT,
             "requestedReferenceRoutes": ["FUEL_EFFICIENT"]
         }
 
@@ -1116,19 +1690,13 @@ async def google_routes_compute_route(params: ComputeRouteInput) -> str:
         if params.departure_time:
             request_body["departureTime"] = params.departure_time
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{ROUTES_API_BASE_URL}/directions/v2:computeRoutes",
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Goog-Api-Key": API_KEY,
-                    "X-Goog-FieldMask": "routes.duration,routes.distanceMeters,routes.polyline,routes.legs.steps,routes.legs.localizedValues,routes.legs.distanceMeters,routes.legs.duration,routes.legs.staticDuration"
-                },
-                json=request_body,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await _google_request(
+            "POST",
+            f"{ROUTES_API_BASE_URL}/directions/v2:computeRoutes",
+            headers=_HEADERS_ROUTE,
+            json=request_body
+        )
+        data = _json_loads(response.content)
 
         routes = data.get("routes", [])
         if not routes:
@@ -1139,49 +1707,54 @@ async def google_routes_compute_route(params: ComputeRouteInput) -> str:
 
         distance_meters = leg.get("distanceMeters", 0)
         distance_miles = _meters_to_miles(distance_meters)
-        duration_seconds = int(leg.get("duration", "0s").replace("s", ""))
-        static_duration = int(leg.get("staticDuration", "0s").replace("s", ""))
+        duration_seconds = _parse_google_seconds(leg.get("duration"))
+        static_duration = _parse_google_seconds(leg.get("staticDuration"))
 
-        # Get steps
+        # Get steps (helpers bound to locals for the per-step loop)
+        to_miles = _meters_to_miles
+        fmt_duration = _format_duration
+        parse_seconds = _parse_google_seconds
         steps = leg.get("steps", [])
         instructions = []
+        add_instruction = instructions.append
         for i, step in enumerate(steps, 1):
-            nav_instruction = step.get("navigationInstruction", {})
-            instructions.append({
+            step_get = step.get
+            instruction = step_get("navigationInstruction", {}).get("instructions", "Continue")
+            add_instruction({
                 "step_number": i,
-                "instruction": nav_instruction.get("instructions", "Continue"),
-                "distance": _meters_to_miles(step.get("distanceMeters", 0)),
-                "duration": _format_duration(int(step.get("duration", "0s").replace("s", "")))
+                "instruction": instruction,
+                "distance": to_miles(step_get("distanceMeters", 0)),
+                "duration": fmt_duration(parse_seconds(step_get("duration")))
             })
 
         # Format response
-        if params.response_format == ResponseFormat.MARKDOWN:
-            lines = [
-                f"# Route: {params.origin} → {params.destination}",
-                f"Travel Mode: {params.travel_mode.value}",
-                "",
-                "## Summary",
-                f"- **Distance**: {distance_miles:.2f} miles ({distance_meters:,} meters)",
-                f"- **Duration**: {_format_duration(duration_seconds)}"
-            ]
+        if params.response_format is _MARKDOWN:
+            buf = io.StringIO()
+            w = buf.write
+            w(f"# Route: {params.origin} → {params.destination}")
+            w(f"\nTravel Mode: {params.travel_mode.value}")
+            w("\n")
+            w("\n## Summary")
+            w(f"\n- **Distance**: {distance_miles:.2f} miles ({distance_meters:,} meters)")
+            w(f"\n- **Duration**: {_format_duration(duration_seconds)}")
 
             if static_duration and static_duration != duration_seconds:
-                lines.append(f"- **Duration without traffic**: {_format_duration(static_duration)}")
+                w(f"\n- **Duration without traffic**: {_format_duration(static_duration)}")
                 traffic_delay = duration_seconds - static_duration
                 if traffic_delay > 0:
-                    lines.append(f"- **Traffic delay**: +{_format_duration(traffic_delay)}")
+                    w(f"\n- **Traffic delay**: +{_format_duration(traffic_delay)}")
 
-            lines.append("")
+            w("\n")
 
             if instructions:
-                lines.append("## Route Instructions")
+                w("\n## Route Instructions")
                 for instr in instructions:
-                    lines.append(f"{instr['step_number']}. {instr['instruction']} - {instr['distance']:.1f} mi ({instr['duration']})")
-                lines.append("")
+                    w(f"\n{instr['step_number']}. {instr['instruction']} - {instr['distance']:.1f} mi ({instr['duration']})")
+                w("\n")
 
-            result = "\n".join(lines)
+            result = buf.getvalue()
         else:
-            result = json.dumps({
+            result = _json_dumps({
                 "origin": params.origin,
                 "destination": params.destination,
                 "travel_mode": params.travel_mode.value,
@@ -1191,7 +1764,7 @@ async def google_routes_compute_route(params: ComputeRouteInput) -> str:
                 "duration_formatted": _format_duration(duration_seconds),
                 "static_duration_seconds": static_duration,
                 "steps": instructions
-            }, indent=2)
+            })
 
         return result
 
@@ -1270,108 +1843,91 @@ async def google_routes_compute_distance_matrix(params: DistanceMatrixInput) ->
         - Some routes may be unavailable (marked in results)
     '''
     if not _check_api_key():
-        return "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+        return _NO_KEY_ERR
 
     try:
         # Validate limits
         if len(params.origins) * len(params.destinations) > 100:
             return "Error: Too many origin-destination combinations (max 100). Reduce the number of origins or destinations."
 
-        request_body = {
-            "origins": [{"address": origin} for origin in params.origins],
-            "destinations": [{"address": dest} for dest in params.destinations],
-            "travelMode": params.travel_mode.value
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{ROUTES_API_BASE_URL}/distanceMatrix/v2:computeRouteMatrix",
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Goog-Api-Key": API_KEY,
-                    "X-Goog-FieldMask": "originIndex,destinationIndex,distanceMeters,duration,status,condition"
-                },
-                json=request_body,
-                timeout=60.0  # Longer timeout for matrix calculations
-            )
-            response.raise_for_status()
-
-            # Routes API returns streaming JSON-L format for distance matrix
-            results = []
-            for line in response.text.strip().split('\n'):
-                if line:
-                    results.append(json.loads(line))
-
-        # Process results
+        # Routes API returns streaming JSON-L format for distance matrix, so each
+        # element is processed as it arrives instead of buffering the whole body
         matrix = []
-        for result in results:
-            origin_idx = result.get("originIndex", 0)
-            dest_idx = result.get("destinationIndex", 0)
-            status = result.get("status")
-
-            if origin_idx < len(params.origins) and dest_idx < len(params.destinations):
-                origin = params.origins[origin_idx]
-                destination = params.destinations[dest_idx]
+        by_origin: Dict[str, List[Dict[str, Any]]] = {}
+        origins, destinations = params.origins, params.destinations
+        origin_count, destination_count = len(origins), len(destinations)
+        to_miles = _meters_to_miles
+        fmt_duration = _format_duration
+        parse_seconds = _parse_google_seconds
+        async for result in _compute_matrix_rows(
+            origins, destinations, params.travel_mode.value
+        ):
+            result_get = result.get
+            origin_idx = result_get("originIndex", 0)
+            dest_idx = result_get("destinationIndex", 0)
+            status = result_get("status")
+
+            if origin_idx < origin_count and dest_idx < destination_count:
+                origin = origins[origin_idx]
+                destination = destinations[dest_idx]
 
                 if status == "OK":
-                    distance_meters = result.get("distanceMeters", 0)
-                    distance_miles = _meters_to_miles(distance_meters)
-                    duration_seconds = int(result.get("duration", "0s").replace("s", ""))
+                    distance_meters = result_get("distanceMeters", 0)
+                    distance_miles = to_miles(distance_meters)
+                    duration_seconds = parse_seconds(result_get("duration"))
 
-                    matrix.append({
+                    entry = {
                         "origin": origin,
                         "destination": destination,
                         "distance_miles": round(distance_miles, 2),
                         "distance_meters": distance_meters,
                         "duration_seconds": duration_seconds,
-                        "duration_formatted": _format_duration(duration_seconds),
+                        "duration_formatted": fmt_duration(duration_seconds),
                         "status": "OK"
-                    })
+                    }
                 else:
-                    matrix.append({
+                    entry = {
                         "origin": origin,
                         "destination": destination,
                         "status": "UNAVAILABLE",
-                        "error": result.get("condition", "No route found")
-                    })
+                        "error": result_get("condition", "No route found")
+                    }
+                matrix.append(entry)
+                by_origin.setdefault(origin, []).append(entry)
 
         # Format response
-        if params.response_format == ResponseFormat.MARKDOWN:
-            lines = [
-                "# Distance Matrix",
-                f"Origins: {len(params.origins)} | Destinations: {len(params.destinations)} | Travel Mode: {params.travel_mode.value}",
-                "",
-                "## Results",
-                ""
-            ]
+        truncation_note = f"\n\n[Response truncated - exceeded {CHARACTER_LIMIT} character limit. Try reducing the number of origins or destinations.]"
+        if params.response_format is _MARKDOWN:
+            buf = _CappedBuffer(truncation_note)
+            w = buf.write
+            w("# Distance Matrix")
+            w(f"\nOrigins: {len(params.origins)} | Destinations: {len(params.destinations)} | Travel Mode: {params.travel_mode.value}")
+            w("\n")
+            w("\n## Results")
+            w("\n")
 
             # Group by origin
             for origin in params.origins:
-                lines.append(f"### From: {origin}")
-                origin_results = [r for r in matrix if r["origin"] == origin]
-
-                for result in origin_results:
+                if buf.truncated:
+                    break
+                w(f"\n### From: {origin}")
+                for result in by_origin.get(origin, ()):
                     if result.get("status") == "OK":
-                        lines.append(f"- To **{result['destination']}**: {result['distance_miles']} mi, {result['duration_formatted']}")
+                        w(f"\n- To **{result['destination']}**: {result['distance_miles']} mi, {result['duration_formatted']}")
                     else:
-                        lines.append(f"- To **{result['destination']}**: Route unavailable ({result.get('error', 'Unknown error')})")
+                        w(f"\n- To **{result['destination']}**: Route unavailable ({result.get('error', 'Unknown error')})")
 
-                lines.append("")
+                w("\n")
 
-            result_text = "\n".join(lines)
+            result_text = buf.getvalue()
         else:
-            result_text = json.dumps({
+            result_text = _json_dumps_capped({
                 "origins": params.origins,
                 "destinations": params.destinations,
                 "travel_mode": params.travel_mode.value,
                 "total_combinations": len(params.origins) * len(params.destinations),
                 "matrix": matrix
-            }, indent=2)
-
-        # Check character limit
-        if len(result_text) > CHARACTER_LIMIT:
-            truncation_note = f"\n\n[Response truncated - exceeded {CHARACTER_LIMIT} character limit. Try reducing the number of origins or destinations.]"
-            result_text = result_text[:CHARACTER_LIMIT - len(truncation_note)] + truncation_note
+            }, truncation_note)
 
         return result_text
 
@@ -1443,57 +1999,60 @@ async def google_geocoding_geocode(params: GeocodeInput) -> str:
         - Returns geocoded info or error message
     '''
     if not _check_api_key():
-        return "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+        return _NO_KEY_ERR
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        cache_key = params.address.lower()
+        result = _geocode_results.get(cache_key)
+        if result is None:
+            response = await _google_request(
+                "GET",
                 f"{GEOCODING_API_BASE_URL}/json",
                 params={
                     "address": params.address,
                     "key": API_KEY
-                },
-                timeout=30.0
+                }
             )
-            response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
+
+            if data.get("status") != "OK":
+                return f"Error: Could not geocode address '{params.address}'. Status: {data.get('status')}"
 
-        if data.get("status") != "OK":
-            return f"Error: Could not geocode address '{params.address}'. Status: {data.get('status')}"
+            result = data.get("results", [{}])[0]
+            _geocode_results[cache_key] = result
 
-        result = data.get("results", [{}])[0]
         coords = result.get("geometry", {}).get("location", {})
 
         # Format response
-        if params.response_format == ResponseFormat.MARKDOWN:
-            lines = [
-                "# Geocoding Result",
-                "",
-                "## Address",
-                f"**Input**: {params.address}",
-                f"**Formatted**: {result.get('formatted_address', 'N/A')}",
-                "",
-                "## Coordinates",
-                f"- **Latitude**: {coords.get('lat')}",
-                f"- **Longitude**: {coords.get('lng')}",
-                ""
-            ]
+        if params.response_format is _MARKDOWN:
+            buf = io.StringIO()
+            w = buf.write
+            w("# Geocoding Result\n")
+            w("\n")
+            w("## Address\n")
+            w(f"**Input**: {params.address}\n")
+            w(f"**Formatted**: {result.get('formatted_address', 'N/A')}\n")
+            w("\n")
+            w("## Coordinates\n")
+            w(f"- **Latitude**: {coords.get('lat')}\n")
+            w(f"- **Longitude**: {coords.get('lng')}\n")
+            w("\n")
 
             # Add location details
             components = result.get("address_components", [])
             if components:
-                lines.append("## Location Details")
+                w("## Location Details\n")
                 for component in components:
                     types = ", ".join(component.get("types", []))
-                    lines.append(f"- **{component.get('long_name')}** ({types})")
-                lines.append("")
+                    w(f"- **{component.get('long_name')}** ({types})\n")
+                w("\n")
 
-            lines.append(f"**Location Type**: {result.get('geometry', {}).get('location_type', 'N/A')}")
-            lines.append(f"**Place ID**: {result.get('place_id', 'N/A')}")
+            w(f"**Location Type**: {result.get('geometry', {}).get('location_type', 'N/A')}\n")
+            w(f"**Place ID**: {result.get('place_id', 'N/A')}")
 
-            result_text = "\n".join(lines)
+            result_text = buf.getvalue()
         else:
-            result_text = json.dumps({
+            result_text = _json_dumps({
                 "input_address": params.address,
                 "formatted_address": result.get("formatted_address"),
                 "coordinates": {
@@ -1503,7 +2062,7 @@ async def google_geocoding_geocode(params: GeocodeInput) -> str:
                 "address_components": result.get("address_components"),
                 "location_type": result.get("geometry", {}).get("location_type"),
                 "place_id": result.get("place_id")
-            }, indent=2)
+            })
 
         return result_text
 
@@ -1571,28 +2130,33 @@ async def google_geocoding_reverse_geocode(params: ReverseGeocodeInput) -> str:
         - Returns address info or error message
     '''
     if not _check_api_key():
-        return "Error: Google Maps API key not configured. Please set the GOOGLE_MAPS_API_KEY environment variable."
+        return _NO_KEY_ERR
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{GEOCODING_API_BASE_URL}/json",
-                params={
-                    "latlng": f"{params.latitude},{params.longitude}",
-                    "key": API_KEY
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        cache_key = (round(params.latitude, 5), round(params.longitude, 5))
+        result = _reverse_geocode_results.get(cache_key)
+        if result is None:
+            async def fetch() -> Dict[str, Any]:
+                response = await _google_request(
+                    "GET",
+                    f"{GEOCODING_API_BASE_URL}/json",
+                    params={
+                        "latlng": f"{params.latitude},{params.longitude}",
+                        "key": API_KEY
+                    }
+                )
+                return _json_loads(response.content)
+
+            data = await _single_flight(("reverse_geocode", cache_key), fetch)
 
-        if data.get("status") != "OK":
-            return f"Error: Could not reverse geocode coordinates ({params.latitude}, {params.longitude}). Status: {data.get('status')}"
+            if data.get("status") != "OK":
+                return f"Error: Could not reverse geocode coordinates ({params.latitude}, {params.longitude}). Status: {data.get('status')}"
 
-        result = data.get("results", [{}])[0]
+            result = data.get("results", [{}])[0]
+            _reverse_geocode_results[cache_key] = result
 
         # Format response
-        if params.response_format == ResponseFormat.MARKDOWN:
+        if params.response_format is _MARKDOWN:
             lines = [
                 "# Reverse Geocoding Result",
                 "",
@@ -1608,16 +2172,17 @@ async def google_geocoding_reverse_geocode(params: ReverseGeocodeInput) -> str:
             components = result.get("address_components", [])
             if components:
                 lines.append("## Location Details")
-                for component in components:
-                    types = ", ".join(component.get("types", []))
-                    lines.append(f"- **{component.get('long_name')}** ({types})")
+                lines.append("\n".join(
+                    f"- **{component.get('long_name')}** ({', '.join(component.get('types', []))})"
+                    for component in components
+                ))
                 lines.append("")
 
             lines.append(f"**Place ID**: {result.get('place_id', 'N/A')}")
 
             result_text = "\n".join(lines)
         else:
-            result_text = json.dumps({
+            result_text = _json_dumps({
                 "coordinates": {
                     "latitude": params.latitude,
                     "longitude": params.longitude
@@ -1625,7 +2190,7 @@ async def google_geocoding_reverse_geocode(params: ReverseGeocodeInput) -> str:
                 "formatted_address": result.get("formatted_address"),
                 "address_components": result.get("address_components"),
                 "place_id": result.get("place_id")
-            }, indent=2)
+            })
 
         return result_text
 
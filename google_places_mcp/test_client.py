@@ -0,0 +1,45 @@
+"""
+Test script for the Google Places MCP shared HTTP client
+
+Checks that the shared client still honors the proxy environment
+(HTTPS_PROXY / ALL_PROXY / NO_PROXY) now that it uses a custom transport.
+No API key or network access is required.
+
+Setup:
+1. Install dependencies: pip install -r requirements.txt
+2. Run: python test_client.py (or pytest test_client.py)
+"""
+
+import asyncio
+import os
+from unittest import mock
+
+import httpx
+
+import server
+
+
+def test_https_proxy_is_mounted():
+    with mock.patch.dict(os.environ, {"HTTPS_PROXY": "http://proxy.example:3128", "NO_PROXY": "internal.example"}):
+        client = server._get_client()
+        server._http_client = None
+    try:
+        proxied = client._transport_for_url(httpx.URL("https://places.googleapis.com/v1/places"))
+        bypassed = client._transport_for_url(httpx.URL("https://internal.example/"))
+        assert proxied is not client._transport, "HTTPS_PROXY was ignored"
+        proxy_url = proxied._pool._proxy_url
+        assert (proxy_url.host, proxy_url.port) == (b"proxy.example", 3128), "wrong proxy mounted"
+        assert bypassed is client._transport, "NO_PROXY was ignored"
+    finally:
+        asyncio.run(client.aclose())
+
+
+if __name__ == "__main__":
+    print("TEST: Shared client honors HTTPS_PROXY and NO_PROXY")
+    print("-" * 60)
+    try:
+        test_https_proxy_is_mounted()
+    except AssertionError as e:
+        print(f"❌ FAIL: {e}")
+        raise SystemExit(1)
+    print("✅ PASS")
@@ -14,9 +14,20 @@ Rate Limits: Reasonable use (500 requests/minute per IP)
 """
 
 from fastmcp import FastMCP
-import requests
-from typing import Optional, Dict, List, Any
-from datetime import datetime
+import asyncio
+import json
+import time
+import httpx
+from typing import Optional, Dict, List, Any, Awaitable, Callable
+from cachetools import TTLCache
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    from rapidfuzz import fuzz, process, utils
+except ImportError:
+    process = None
 
 # Initialize FastMCP server
 mcp = FastMCP("medicare-hospital")
@@ -28,9 +39,179 @@ MEDICARE_API_BASE = "https://data.cms.gov/provider-data/api/1"
 HOSPITALS_ENDPOINT = f"{MEDICARE_API_BASE}/datastore/query/xubh-q36u"  # Hospital General Information
 QUALITY_ENDPOINT = f"{MEDICARE_API_BASE}/datastore/query/4pq5-n9py"   # Hospital Overall Ratings
 
+# Query filter (path, operator) pairs; callers append the matching [value] pair
+_ZIP_FILTER = (("filter[zip][condition][path]", "zip_code"), ("filter[zip][condition][operator]", "="))
+_STATE_FILTER = (("filter[state][condition][path]", "state"), ("filter[state][condition][operator]", "="))
+_CITY_FILTER = (("filter[city][condition][path]", "city"), ("filter[city][condition][operator]", "="))
+_ID_FILTER = (("filter[id][condition][path]", "facility_id"), ("filter[id][condition][operator]", "="))
+
+# Quality measure categories: (response key, national comparison column, description)
+_MEASURES = (
+    ("mortality", "mortality_national_comparison", "Death rates for common conditions"),
+    ("safety_of_care", "safety_of_care_national_comparison", "Infections, complications, medical errors"),
+    ("readmission", "readmission_national_comparison", "Rate of patients readmitted within 30 days"),
+    ("patient_experience", "patient_experience_national_comparison", "Patient survey results (HCAHPS)"),
+    ("timeliness_of_care", "timeliness_of_care_national_comparison", "How quickly patients receive care"),
+    ("effective_care", "effective_care_national_comparison", "Following best practices for treatment"),
+)
+
+# Comparison ratings explained
+_RATING_GUIDE = {
+    "Above the national average": "Better than most hospitals",
+    "Same as the national average": "Similar to most hospitals",
+    "Below the national average": "Worse than most hospitals",
+    "Not Available": "Insufficient data"
+}
+
+# get_hospital_rating reads a city's hospitals in pages: the first page alone when it
+# holds an exact name match, otherwise all pages up to RATING_MAX_ROWS
+RATING_PAGE_SIZE = 25
+RATING_MAX_ROWS = 100
+
+# Retries for rate limiting and transient server errors from data.cms.gov
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3  # seconds, doubled after each attempt
+MAX_RETRY_WAIT = 10.0  # seconds; caps a long Retry-After
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Shared client so repeat calls reuse keep-alive connections to data.cms.gov
+_http_client: Optional[httpx.AsyncClient] = None
+
+# CMS refreshes this data quarterly, so successful lookups are cached for a few hours.
+# Cache reads and writes never straddle an await, so no lock is needed.
+CACHE_TTL = 6 * 3600  # seconds
+_rating_cache = TTLCache(maxsize=1024, ttl=CACHE_TTL)
+_search_cache = TTLCache(maxsize=1024, ttl=CACHE_TTL)
+_quality_cache = TTLCache(maxsize=1024, ttl=CACHE_TTL)
+
+# Lookups currently on the wire, by provider ID, so concurrent misses share one request
+_inflight: Dict[str, asyncio.Task] = {}
+
+# Response timestamps have one-second resolution, so the formatted string is reused within a second
+_ts_second = 0
+_ts_cached = ""
+
+
+def _now() -> str:
+    """Current UTC time as an ISO 8601 string, e.g. 2025-11-03T14:30:00Z"""
+    global _ts_second, _ts_cached
+    second = int(time.time())
+    if second != _ts_second:
+        _ts_second = second
+        _ts_cached = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+    return _ts_cached
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a JSON response body, using orjson when it is installed"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+        )
+    return _http_client
+
+
+async def _close_client() -> None:
+    """Close the shared HTTP client; the next request opens a new one"""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
+
+def _retry_delay(attempt: int, response: httpx.Response) -> float:
+    """Exponential backoff, waiting at least as long as a numeric Retry-After header"""
+    delay = RETRY_BACKOFF * 2 ** attempt
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return min(delay, MAX_RETRY_WAIT)
+
+
+async def _query_quality(params: Any) -> Dict[str, Any]:
+    """Query the hospital ratings dataset, retrying 429 and 5xx responses with backoff
+
+    Raises httpx.HTTPStatusError for any other error status or once retries are exhausted.
+    """
+    client = _get_client()
+    for attempt in range(MAX_RETRIES + 1):
+        response = await client.get(QUALITY_ENDPOINT, params=params)
+        if response.is_success:
+            return _json_loads(response.content)
+        if response.status_code not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+            response.raise_for_status()
+        await asyncio.sleep(_retry_delay(attempt, response))
+
+
+def _exact_hospital_match(hospital_name: str, hospitals: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the hospital whose facility name equals hospital_name ignoring case, or None"""
+    hospital_name_lower = hospital_name.lower()
+    for hospital in hospitals:
+        if hospital.get('facility_name', '').lower() == hospital_name_lower:
+            return hospital
+    return None
+
+
+def _match_hospital(hospital_name: str, hospitals: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the hospital whose facility name best matches hospital_name, or None
+
+    Tries, in order: an exact (case-insensitive) name match, a substring match
+    either way round, and, when rapidfuzz is installed, a fuzzy match. The fuzzy
+    step uses token_sort_ratio, which tolerates case, punctuation and word order
+    but, unlike WRatio, gives no credit for a name that is only a subset of a
+    longer one, so "Candler Hospital" does not resolve to "Candler County
+    Hospital". Names must score at least 90.
+    """
+    exact = _exact_hospital_match(hospital_name, hospitals)
+    if exact is not None:
+        return exact
+
+    hospital_name_lower = hospital_name.lower()
+    facility_names = [hospital.get('facility_name', '').lower() for hospital in hospitals]
+    for hospital, facility_name in zip(hospitals, facility_names):
+        if hospital_name_lower in facility_name or facility_name in hospital_name_lower:
+            return hospital
+
+    if process is not None and hospitals:
+        best = process.extractOne(
+            hospital_name,
+            facility_names,
+            scorer=fuzz.token_sort_ratio,
+            processor=utils.default_process,
+            score_cutoff=90
+        )
+        if best is not None:
+            return hospitals[best[2]]
+    return None
+
+
+def _cache_get(cache: TTLCache, key: Any) -> Optional[Dict[str, Any]]:
+    """Return a copy of a cached tool result stamped with the current time, or None on a miss
+
+    The stored entry keeps the time it was fetched; every response carries the
+    time it was served, whether it came from the cache or not.
+    """
+    result = cache.get(key)
+    if result is None:
+        return None
+    return {**result, "timestamp": _now()}
+
+
+def _cache_set(cache: TTLCache, key: Any, result: Dict[str, Any]) -> None:
+    """Cache a tool result if the lookup succeeded"""
+    if result.get("status") == "success":
+        cache[key] = result
+
 
 @mcp.tool()
-def get_hospital_rating(
+async def get_hospital_rating(
     hospital_name: str,
     city: str,
     state: str
@@ -49,33 +230,38 @@ def get_hospital_rating(
     Example:
         get_hospital_rating("Memorial Health University Medical Center", "Savannah", "GA")
     """
+    cache_key = (hospital_name.lower(), city.lower(), state.upper())
+    cached = _cache_get(_rating_cache, cache_key)
+    if cached is not None:
+        return cached
+
     try:
         # Query Medicare API for hospital ratings
-        params = {
-            "filter[state][condition][path]": "state",
-            "filter[state][condition][operator]": "=",
-            "filter[state][condition][value]": state.upper(),
-            "filter[city][condition][path]": "city",
-            "filter[city][condition][operator]": "=",
-            "filter[city][condition][value]": city.upper(),
-            "limit": 100
-        }
-
-        response = requests.get(QUALITY_ENDPOINT, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        params = [
+            *_STATE_FILTER,
+            ("filter[state][condition][value]", state.upper()),
+            *_CITY_FILTER,
+            ("filter[city][condition][value]", city.upper()),
+            ("limit", RATING_PAGE_SIZE)
+        ]
+
+        # An exact name match on the first page settles it. Otherwise fetch the
+        # remaining pages together and match once across all rows, so a close
+        # but wrong name on an early page can't win over the right hospital later.
+        data = await _query_quality([*params, ("offset", 0)])
         results = data.get('results', [])
-
-        # Search for matching hospital
-        matches = []
-        hospital_name_lower = hospital_name.lower()
-        for hospital in results:
-            facility_name = hospital.get('facility_name', '').lower()
-            if hospital_name_lower in facility_name or facility_name in hospital_name_lower:
-                matches.append(hospital)
-
-        if not matches:
+        hospital = _exact_hospital_match(hospital_name, results)
+        if hospital is None:
+            if len(results) == RATING_PAGE_SIZE:
+                pages = await asyncio.gather(*(
+                    _query_quality([*params, ("offset", offset)])
+                    for offset in range(RATING_PAGE_SIZE, RATING_MAX_ROWS, RATING_PAGE_SIZE)
+                ))
+                for page in pages:
+                    results.extend(page.get('results', []))
+            hospital = _match_hospital(hospital_name, results)
+
+        if hospital is None:
             return {
                 "status": "not_found",
                 "message": f"No hospital found matching '{hospital_name}' in {city}, {state}",
@@ -86,13 +272,10 @@ def get_hospital_rating(
                 },
                 "suggestion": "Try searching by location first to see available hospitals",
                 "source": "Medicare Hospital Compare (data.cms.gov)",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now()
             }
 
-        # Return the best match
-        hospital = matches[0]
-
-        return {
+        result = {
             "status": "success",
             "hospital_name": hospital.get('facility_name'),
             "address": hospital.get('address'),
@@ -115,15 +298,17 @@ def get_hospital_rating(
             "emergency_services": hospital.get('emergency_services'),
             "source": "Medicare Hospital Compare (data.cms.gov)",
             "data_date": hospital.get('measure_end_date'),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now()
         }
+        _cache_set(_rating_cache, cache_key, result)
+        return result
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         return {
             "status": "error",
             "error": f"API request failed: {str(e)}",
             "source": "Medicare Hospital Compare (data.cms.gov)",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now()
         }
     except Exception as e:
         return {
@@ -133,7 +318,7 @@ def get_hospital_rating(
 
 
 @mcp.tool()
-def search_hospitals(
+async def search_hospitals(
     zip_code: Optional[str] = None,
     city: Optional[str] = None,
     state: Optional[str] = None,
@@ -162,35 +347,30 @@ def search_hospitals(
                 "error": "Must provide either zip_code or both city and state"
             }
 
+        cache_key = (zip_code, city, state, limit)
+        cached = _cache_get(_search_cache, cache_key)
+        if cached is not None:
+            return cached
+
         # Build query filters
-        filters = {}
-        filter_count = 0
+        filters = []
 
         if zip_code:
-            filters[f"filter[zip][condition][path]"] = "zip_code"
-            filters[f"filter[zip][condition][operator]"] = "="
-            filters[f"filter[zip][condition][value]"] = zip_code
-            filter_count += 1
+            filters.extend(_ZIP_FILTER)
+            filters.append(("filter[zip][condition][value]", zip_code))
 
         if state:
-            filters[f"filter[state][condition][path]"] = "state"
-            filters[f"filter[state][condition][operator]"] = "="
-            filters[f"filter[state][condition][value]"] = state.upper()
-            filter_count += 1
+            filters.extend(_STATE_FILTER)
+            filters.append(("filter[state][condition][value]", state.upper()))
 
         if city:
-            filters[f"filter[city][condition][path]"] = "city"
-            filters[f"filter[city][condition][operator]"] = "="
-            filters[f"filter[city][condition][value]"] = city.upper()
-            filter_count += 1
+            filters.extend(_CITY_FILTER)
+            filters.append(("filter[city][condition][value]", city.upper()))
 
-        filters["limit"] = min(limit, 50)
+        filters.append(("limit", min(limit, 50)))
 
         # Query Medicare API
-        response = requests.get(QUALITY_ENDPOINT, params=filters, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = await _query_quality(filters)
         results = data.get('results', [])
 
         hospitals = []
@@ -209,7 +389,7 @@ def search_hospitals(
                 "medicare_provider_id": hospital.get('facility_id')
             })
 
-        return {
+        result = {
             "status": "success",
             "search_params": {
                 "zip_code": zip_code,
@@ -219,10 +399,12 @@ def search_hospitals(
             "total_found": len(hospitals),
             "hospitals": hospitals,
             "source": "Medicare Hospital Compare (data.cms.gov)",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now()
         }
+        _cache_set(_search_cache, cache_key, result)
+        return result
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         return {
             "status": "error",
             "error": f"API request failed: {str(e)}"
@@ -234,99 +416,109 @@ def search_hospitals(
         }
 
 
-@mcp.tool()
-def get_hospital_quality_measures(
-    medicare_provider_id: str
-) -> Dict[str, Any]:
+def _quality_measures_result(hospital: Dict[str, Any], medicare_provider_id: str) -> Dict[str, Any]:
+    """Build the get_hospital_quality_measures response from a hospital row"""
+    # Organize quality measures by category
+    quality_measures = {
+        "overall_rating": {
+            "rating": hospital.get('hospital_overall_rating'),
+            "rating_scale": "1-5 stars",
+            "footnote": hospital.get('hospital_overall_rating_footnote')
+        },
+        **{
+            key: {"national_comparison": hospital.get(column), "description": description}
+            for key, column, description in _MEASURES
+        }
+    }
+
+    return {
+        "status": "success",
+        "hospital_name": hospital.get('facility_name'),
+        "medicare_provider_id": medicare_provider_id,
+        "quality_measures": quality_measures,
+        "rating_guide": _RATING_GUIDE,
+        "data_date": hospital.get('measure_end_date'),
+        "source": "Medicare Hospital Compare (data.cms.gov)",
+        "timestamp": _now()
+    }
+
+
+async def _fetch_hospital_rows(provider_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch hospital rows for several provider IDs in one IN query, keyed by facility_id"""
+    params = {
+        "filter[id][condition][path]": "facility_id",
+        "filter[id][condition][operator]": "IN",
+        "filter[id][condition][value][]": provider_ids,
+        "limit": len(provider_ids)
+    }
+
+    data = await _query_quality(params)
+
+    return {
+        hospital.get('facility_id'): hospital
+        for hospital in data.get('results', [])
+    }
+
+
+async def _single_flight(key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Run fetch() once per key at a time; concurrent callers with the same key share its result
+
+    The fetch runs as its own task and every caller awaits it through a shield,
+    so one cancelled caller does not cancel the lookup for the others.
     """
-    Get detailed quality measures for a specific hospital
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
 
-    Args:
-        medicare_provider_id: Medicare Provider ID (6-digit number)
+        def _done(t: asyncio.Task) -> None:
+            _inflight.pop(key, None)
+            if not t.cancelled():
+                t.exception()  # Mark retrieved in case every caller was cancelled
 
-    Returns:
-        Dictionary with detailed quality metrics by category
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
 
-    Example:
-        get_hospital_quality_measures("110079")
-    """
-    try:
-        # Query for specific hospital by provider ID
-        params = {
-            "filter[id][condition][path]": "facility_id",
-            "filter[id][condition][operator]": "=",
-            "filter[id][condition][value]": medicare_provider_id
-        }
 
-        response = requests.get(QUALITY_ENDPOINT, params=params, timeout=10)
-        response.raise_for_status()
+async def _fetch_quality_measures(medicare_provider_id: str) -> Dict[str, Any]:
+    """Look up quality measures for one hospital (shared by the tool and compare_hospitals)"""
+    cached = _cache_get(_quality_cache, medicare_provider_id)
+    if cached is not None:
+        return cached
 
-        data = response.json()
-        results = data.get('results', [])
+    return await _single_flight(
+        medicare_provider_id,
+        lambda: _load_quality_measures(medicare_provider_id)
+    )
 
-        if not results:
-            return {
-                "status": "not_found",
-                "message": f"No hospital found with Medicare Provider ID: {medicare_provider_id}",
-                "source": "Medicare Hospital Compare (data.cms.gov)",
-                "timestamp": datetime.utcnow().isoformat()
-            }
 
-        hospital = results[0]
+def _quality_not_found(medicare_provider_id: str) -> Dict[str, Any]:
+    """Build the result returned when no hospital has the given provider ID"""
+    return {
+        "status": "not_found",
+        "message": f"No hospital found with Medicare Provider ID: {medicare_provider_id}",
+        "source": "Medicare Hospital Compare (data.cms.gov)",
+        "timestamp": _now()
+    }
 
-        # Organize quality measures by category
-        quality_measures = {
-            "overall_rating": {
-                "rating": hospital.get('hospital_overall_rating'),
-                "rating_scale": "1-5 stars",
-                "footnote": hospital.get('hospital_overall_rating_footnote')
-            },
-            "mortality": {
-                "national_comparison": hospital.get('mortality_national_comparison'),
-                "description": "Death rates for common conditions"
-            },
-            "safety_of_care": {
-                "national_comparison": hospital.get('safety_of_care_national_comparison'),
-                "description": "Infections, complications, medical errors"
-            },
-            "readmission": {
-                "national_comparison": hospital.get('readmission_national_comparison'),
-                "description": "Rate of patients readmitted within 30 days"
-            },
-            "patient_experience": {
-                "national_comparison": hospital.get('patient_experience_national_comparison'),
-                "description": "Patient survey results (HCAHPS)"
-            },
-            "timeliness_of_care": {
-                "national_comparison": hospital.get('timeliness_of_care_national_comparison'),
-                "description": "How quickly patients receive care"
-            },
-            "effective_care": {
-                "national_comparison": hospital.get('effective_care_national_comparison'),
-                "description": "Following best practices for treatment"
-            }
-        }
 
-        # Comparison ratings explained
-        rating_guide = {
-            "Above the national average": "Better than most hospitals",
-            "Same as the national average": "Similar to most hospitals",
-            "Below the national average": "Worse than most hospitals",
-            "Not Available": "Insufficient data"
-        }
+async def _load_quality_measures(medicare_provider_id: str) -> Dict[str, Any]:
+    """Query data.cms.gov for one hospital's quality measures and cache a successful result"""
+    try:
+        # Query for specific hospital by provider ID
+        params = [*_ID_FILTER, ("filter[id][condition][value]", medicare_provider_id)]
 
-        return {
-            "status": "success",
-            "hospital_name": hospital.get('facility_name'),
-            "medicare_provider_id": medicare_provider_id,
-            "quality_measures": quality_measures,
-            "rating_guide": rating_guide,
-            "data_date": hospital.get('measure_end_date'),
-            "source": "Medicare Hospital Compare (data.cms.gov)",
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        data = await _query_quality(params)
+        results = data.get('results', [])
+
+        if not results:
+            return _quality_not_found(medicare_provider_id)
+
+        result = _quality_measures_result(results[0], medicare_provider_id)
+        _cache_set(_quality_cache, medicare_provider_id, result)
+        return result
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         return {
             "status": "error",
             "error": f"API request failed: {str(e)}"
@@ -339,7 +531,26 @@ def get_hospital_quality_measures(
 
 
 @mcp.tool()
-def compare_hospitals(
+async def get_hospital_quality_measures(
+    medicare_provider_id: str
+) -> Dict[str, Any]:
+    """
+    Get detailed quality measures for a specific hospital
+
+    Args:
+        medicare_provider_id: Medicare Provider ID (6-digit number)
+
+    Returns:
+        Dictionary with detailed quality metrics by category
+
+    Example:
+        get_hospital_quality_measures("110079")
+    """
+    return await _fetch_quality_measures(medicare_provider_id)
+
+
+@mcp.tool()
+async def compare_hospitals(
     hospital_ids: List[str]
 ) -> Dict[str, Any]:
     """
@@ -361,9 +572,35 @@ def compare_hospitals(
                 "error": "Maximum 5 hospitals can be compared at once"
             }
 
+        # Serve cached hospitals, then fetch the rest in one IN query. IDs it
+        # does not return are not found; only if the query itself fails do
+        # they fall back to concurrent per-ID lookups.
+        unique_ids = list(dict.fromkeys(hospital_ids))
+        results = {}
+        for provider_id in unique_ids:
+            cached = _cache_get(_quality_cache, provider_id)
+            if cached is not None:
+                results[provider_id] = cached
+        uncached_ids = [provider_id for provider_id in unique_ids if provider_id not in results]
+
+        if uncached_ids:
+            try:
+                by_id = await _fetch_hospital_rows(uncached_ids)
+            except httpx.HTTPError:
+                results.update(zip(uncached_ids, await asyncio.gather(*(_fetch_quality_measures(provider_id) for provider_id in uncached_ids))))
+            else:
+                for provider_id in uncached_ids:
+                    hospital = by_id.get(provider_id)
+                    if hospital is None:
+                        results[provider_id] = _quality_not_found(provider_id)
+                    else:
+                        result = _quality_measures_result(hospital, provider_id)
+                        _cache_set(_quality_cache, provider_id, result)
+                        results[provider_id] = result
+
         comparisons = []
         for provider_id in hospital_ids:
-            result = get_hospital_quality_measures(provider_id)
+            result = results[provider_id]
             if result['status'] == 'success':
                 comparisons.append({
                     "hospital_name": result['hospital_name'],
@@ -388,7 +625,7 @@ def compare_hospitals(
             "total_compared": len(comparisons),
             "hospitals": comparisons,
             "source": "Medicare Hospital Compare (data.cms.gov)",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now()
         }
 
     except Exception as e:
@@ -398,6 +635,18 @@ def compare_hospitals(
         }
 
 
+async def _serve() -> None:
+    """Run the MCP server over stdio, closing the shared HTTP client on shutdown
+
+    fastmcp 0.x has no shutdown hook, so the server runs on our own event loop
+    and the client is closed on that same loop once the server returns.
+    """
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await _close_client()
+
+
 if __name__ == "__main__":
     # Run the MCP server
-    mcp.run()
+    asyncio.run(_serve())
@@ -11,6 +11,8 @@ Setup:
 No API key required - Medicare data is publicly accessible.
 """
 
+import asyncio
+
 # Import server functions
 from server import (
     get_hospital_rating,
@@ -19,6 +21,9 @@ from server import (
     compare_hospitals
 )
 
+# The tools are coroutines sharing one HTTP client, so run them all on one event loop
+run = asyncio.new_event_loop().run_until_complete
+
 print("=" * 60)
 print("MEDICARE HOSPITAL COMPARE MCP TEST SUITE")
 print("=" * 60)
@@ -34,7 +39,7 @@ TEST_ZIP = "31419"
 # Test 1: Search Hospitals by ZIP
 print("TEST 1: Search Hospitals by ZIP Code")
 print("-" * 60)
-result = search_hospitals(zip_code=TEST_ZIP, limit=5)
+result = run(search_hospitals(zip_code=TEST_ZIP, limit=5))
 if result['status'] == 'success':
     print("✅ PASS")
     print(f"   Found: {result['total_found']} hospitals near ZIP {TEST_ZIP}")
@@ -53,7 +58,7 @@ print()
 # Test 2: Search Hospitals by City/State
 print("TEST 2: Search Hospitals by City and State")
 print("-" * 60)
-result = search_hospitals(city=TEST_CITY, state=TEST_STATE, limit=5)
+result = run(search_hospitals(city=TEST_CITY, state=TEST_STATE, limit=5))
 if result['status'] == 'success':
     print("✅ PASS")
     print(f"   Found: {result['total_found']} hospitals in {TEST_CITY}, {TEST_STATE}")
@@ -66,7 +71,7 @@ print("TEST 3: Get Hospital Rating by Name")
 print("-" * 60)
 if hospitals:
     test_hospital_name = hospitals[0]['hospital_name']
-    result = get_hospital_rating(test_hospital_name, TEST_CITY, TEST_STATE)
+    result = run(get_hospital_rating(test_hospital_name, TEST_CITY, TEST_STATE))
     if result['status'] == 'success':
         print("✅ PASS")
         print(f"   Hospital: {result['hospital_name']}")
@@ -96,7 +101,7 @@ print("TEST 4: Get Detailed Quality Measures")
 print("-" * 60)
 if hospitals:
     provider_id = hospitals[0]['medicare_provider_id']
-    result = get_hospital_quality_measures(provider_id)
+    result = run(get_hospital_quality_measures(provider_id))
     if result['status'] == 'success':
         print("✅ PASS")
         print(f"   Hospital: {result['hospital_name']}")
@@ -120,7 +125,7 @@ print("TEST 5: Compare Multiple Hospitals")
 print("-" * 60)
 if len(hospitals) >= 2:
     ids_to_compare = [h['medicare_provider_id'] for h in hospitals[:2]]
-    result = compare_hospitals(ids_to_compare)
+    result = run(compare_hospitals(ids_to_compare))
     if result['status'] == 'success':
         print("✅ PASS")
         print(f"   Comparing {result['total_compared']} hospitals:")
@@ -8,30 +8,64 @@ the latest Perplexity models (sonar, sonar-pro, sonar-deep-research, sonar-reaso
 """
 
 import os
+import io
 import json
-from typing import Optional, List, Dict, Any
-from enum import Enum
+import hashlib
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Sequence
+from enum import StrEnum
 
 import httpx
+from cachetools import TTLCache
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP client when the server shuts down."""
+    try:
+        yield
+    finally:
+        await _close_client()
 
 # Initialize the MCP server
-mcp = FastMCP("perplexity-mcp")
+mcp = FastMCP("perplexity-mcp", lifespan=_lifespan)
 
 # Constants
 API_BASE_URL = "https://api.perplexity.ai"
 CHARACTER_LIMIT = 25000  # Maximum response size in characters
 DEFAULT_TEMPERATURE = 0.2
 DEFAULT_MAX_TOKENS = 4096
+REQUEST_TIMEOUT = 60.0  # Seconds; deep research calls can be slow
+
+# Retries for rate limiting and transient server errors
+MAX_RETRIES = 3
+MAX_RETRY_WAIT = 30.0  # seconds
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Successful API responses, keyed by a hash of the request body. Answers are
+# grounded in live web search, so entries expire after an hour. Lookups and
+# stores never straddle an await, so no lock is needed.
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 3600  # seconds
+_response_cache: TTLCache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+# Requests currently on the wire, by cache key, so concurrent identical calls share one request
+_inflight: Dict[Any, asyncio.Task] = {}
+
+# Shared client, created on first request; the API key is read at that point
+_http_client: Optional[httpx.AsyncClient] = None
 
 
 # Enums
-class PerplexityModel(str, Enum):
+class PerplexityModel(StrEnum):
     """Available Perplexity AI models."""
     SONAR = "sonar"
     SONAR_PRO = "sonar-pro"
@@ -40,26 +74,48 @@ class PerplexityModel(str, Enum):
     SONAR_REASONING_PRO = "sonar-reasoning-pro"
 
 
-class SearchMode(str, Enum):
+class SearchMode(StrEnum):
     """Search modes for Perplexity API."""
     WEB = "web"
     ACADEMIC = "academic"
     SEC = "sec"
 
 
-class ReasoningEffort(str, Enum):
+class ReasoningEffort(StrEnum):
     """Reasoning effort levels for deep research."""
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
 
+# Fixed parts of each tool's request payload; the tools merge in per-call fields
+_SEARCH_PAYLOAD = {
+    "model": PerplexityModel.SONAR_PRO,  # Use sonar-pro for best search results
+    "max_tokens": DEFAULT_MAX_TOKENS,
+    "temperature": 0.2  # Lower temperature for factual search results
+}
+_RESEARCH_PAYLOAD = {
+    "model": PerplexityModel.SONAR_DEEP_RESEARCH,
+    "return_related_questions": True,  # Always return for research
+    "max_tokens": 16384,  # Higher limit for comprehensive research
+    "temperature": 0.1  # Low temperature for factual research
+}
+_REASON_PAYLOAD = {
+    "max_tokens": 8192,  # Higher limit for detailed reasoning
+    "disable_search": True  # Disable web search for pure reasoning
+}
+_REASON_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert reasoning engine. Analyze problems step-by-step, consider multiple perspectives, and provide clear logical deductions."
+}
+
+
 # Pydantic Models for Input Validation
 class PerplexityAskInput(BaseModel):
     """Input model for general chat completions with Perplexity AI."""
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
+        frozen=True,
         extra='forbid'
     )
 
@@ -114,7 +170,7 @@ class PerplexitySearchInput(BaseModel):
     """Input model for focused web search with Perplexity AI."""
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
+        frozen=True,
         extra='forbid'
     )
 
@@ -165,7 +221,7 @@ class PerplexityResearchInput(BaseModel):
     """Input model for deep exhaustive research with Perplexity AI."""
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
+        frozen=True,
         extra='forbid'
     )
 
@@ -202,7 +258,7 @@ class PerplexityReasonInput(BaseModel):
     """Input model for reasoning and problem-solving with Perplexity AI."""
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
+        frozen=True,
         extra='forbid'
     )
 
@@ -234,17 +290,84 @@ class PerplexityReasonInput(BaseModel):
     @classmethod
     def validate_model(cls, v: PerplexityModel) -> PerplexityModel:
         if v not in [PerplexityModel.SONAR_REASONING, PerplexityModel.SONAR_REASONING_PRO]:
-            raise ValueError(f"Model must be either '{PerplexityModel.SONAR_REASONING.value}' or '{PerplexityModel.SONAR_REASONING_PRO.value}' for reasoning tasks")
+            raise ValueError(f"Model must be either '{PerplexityModel.SONAR_REASONING}' or '{PerplexityModel.SONAR_REASONING_PRO}' for reasoning tasks")
         return v
 
 
 # Shared utility functions
-def _get_api_key() -> str:
-    """Get Perplexity API key from environment variables."""
-    api_key = os.getenv("PERPLEXITY_API_KEY")
-    if not api_key:
-        raise ValueError("PERPLEXITY_API_KEY not set in .env file")
-    return api_key
+def _get_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP client, creating it on first use.
+
+    Reusing one client keeps the connection to api.perplexity.ai alive between
+    tool calls, so only the first request pays for the TLS handshake, and HTTP/2
+    lets concurrent calls share that connection. The base URL and auth headers
+    are set once on the client, so the API key is looked up only here: first in
+    the environment, then in a .env file. python-dotenv is imported only when
+    that fallback is needed, keeping it off the startup path. Creation has no
+    await, so concurrent first calls cannot race.
+
+    Raises:
+        ValueError: If PERPLEXITY_API_KEY is not set
+    """
+    global _http_client
+    if _http_client is None:
+        api_key = os.getenv("PERPLEXITY_API_KEY")
+        if not api_key:
+            from dotenv import dotenv_values
+            api_key = dotenv_values().get("PERPLEXITY_API_KEY")
+        if not api_key:
+            raise ValueError("PERPLEXITY_API_KEY not set in .env file")
+        _http_client = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            http2=True,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            timeout=httpx.Timeout(REQUEST_TIMEOUT),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return _http_client
+
+
+async def _close_client() -> None:
+    """Close the shared HTTP client if one was created; the next request opens a new one."""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
+
+def _retry_delay(attempt: int, response: httpx.Response) -> float:
+    """Exponential backoff with jitter, waiting at least as long as a numeric Retry-After header."""
+    delay = 2 ** attempt + random.random()
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return min(delay, MAX_RETRY_WAIT)
+
+
+async def _single_flight(key: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run fetch() once per key at a time; concurrent callers with the same key await its result.
+
+    The request runs as its own task and every caller, the first included, awaits
+    it through a shield, so a cancelled caller never cancels the shared request
+    for the others. Exceptions propagate to every caller.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+
+        def _done(t: asyncio.Task) -> None:
+            _inflight.pop(key, None)
+            if not t.cancelled():
+                t.exception()  # Mark retrieved in case every caller was cancelled
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
 
 
 async def _make_api_request(
@@ -253,7 +376,11 @@ async def _make_api_request(
     stream: bool = False
 ) -> Dict[str, Any]:
     """
-    Make authenticated request to Perplexity API.
+    Make authenticated request to Perplexity API, serving repeats from the response cache.
+
+    Identical requests made while one is already in flight wait for its response.
+    Cache hits come back as a shallow copy with "cached" set, so the tools can
+    report that no tokens were spent on them. Rate limits (429) and transient server errors are retried with backoff.
 
     Args:
         endpoint: API endpoint (e.g., '/chat/completions')
@@ -261,28 +388,55 @@ async def _make_api_request(
         stream: Whether to use streaming (default: False)
 
     Returns:
-        API response as dictionary
+        API response as dictionary, with "cached": True when served from the cache
 
     Raises:
-        httpx.HTTPStatusError: For API errors
+        httpx.HTTPStatusError: For API errors, once retries are exhausted
         httpx.TimeoutException: For timeout errors
     """
-    api_key = _get_api_key()
+    # The client already carries the JSON content type, so send pre-encoded bytes.
+    # Keys are sorted, so the body doubles as the canonical cache key.
+    body = _json_dumps(payload)
+    cache_key = (endpoint, hashlib.blake2b(body, digest_size=16).digest())
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    async def fetch() -> Dict[str, Any]:
+        client = _get_client()
+        for attempt in range(MAX_RETRIES + 1):
+            response = await client.post(endpoint, content=body)
+            if response.status_code not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            await asyncio.sleep(_retry_delay(attempt, response))
+        response.raise_for_status()
+        # The body is a single JSON document, so it can't be cut off early and
+        # still parse; the tools cap output at CHARACTER_LIMIT when formatting.
+        data = _json_loads(response.content)
+        _response_cache[cache_key] = data
+        return data
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+    return await _single_flight(cache_key, fetch)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{API_BASE_URL}{endpoint}",
-            headers=headers,
-            json=payload,
-            timeout=60.0
-        )
-        response.raise_for_status()
-        return response.json()
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a JSON response body, using orjson when it is installed."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a request body as compact UTF-8 JSON with sorted keys, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+# Fixed messages for API status codes that need no details from the response
+_STATUS_ERRORS = {
+    401: "Error: Invalid API key. Please check your PERPLEXITY_API_KEY in the .env file.",
+    429: "Error: Rate limit exceeded. Please wait a moment before making more requests.",
+    500: "Error: Perplexity API server error. Please try again later."
+}
 
 
 def _handle_api_error(e: Exception) -> str:
@@ -301,18 +455,16 @@ def _handle_api_error(e: Exception) -> str:
     if isinstance(e, httpx.HTTPStatusError):
         status_code = e.response.status_code
 
-        if status_code == 401:
-            return "Error: Invalid API key. Please check your PERPLEXITY_API_KEY in the .env file."
-        elif status_code == 429:
-            return "Error: Rate limit exceeded. Please wait a moment before making more requests."
-        elif status_code == 400:
+        message = _STATUS_ERRORS.get(status_code)
+        if message is not None:
+            return message
+        if status_code == 400:
             try:
-                error_detail = e.response.json()
+                error_detail = _json_loads(e.response.content)
                 return f"Error: Invalid request - {error_detail.get('error', {}).get('message', 'Bad request')}"
-            except:
+            except (ValueError, AttributeError):
+                # Body is not JSON (decode errors subclass ValueError) or not an error object
                 return "Error: Invalid request. Please check your parameters."
-        elif status_code == 500:
-            return "Error: Perplexity API server error. Please try again later."
 
         return f"Error: API request failed with status {status_code}"
 
@@ -322,26 +474,69 @@ def _handle_api_error(e: Exception) -> str:
     return f"Error: Unexpected error occurred: {type(e).__name__} - {str(e)}"
 
 
-def _truncate_if_needed(content: str, limit: int = CHARACTER_LIMIT) -> str:
+class _CappedBuffer:
+    """
+    StringIO that keeps at most CHARACTER_LIMIT characters of tool output.
+
+    Every write is counted, but text past the limit is never stored, so the full
+    response is not assembled just to be cut. getvalue() appends a truncation
+    notice with the original length when anything was dropped, giving the same
+    result as slicing the full text.
+    """
+    __slots__ = ("_buf", "_written")
+
+    def __init__(self):
+        self._buf = io.StringIO()
+        self._written = 0
+
+    def write(self, text: str) -> None:
+        room = CHARACTER_LIMIT - self._written
+        self._written += len(text)
+        if room > 0:
+            self._buf.write(text if len(text) <= room else text[:room])
+
+    def getvalue(self) -> str:
+        content = self._buf.getvalue()
+        if self._written <= CHARACTER_LIMIT:
+            return content
+        return content + f"\n\n[Response truncated at {CHARACTER_LIMIT} characters. Original length: {self._written} characters]"
+
+
+def _extract_answer(response: Dict[str, Any], default: str) -> str:
     """
-    Truncate content if it exceeds character limit.
+    Get the text of the first choice from a chat completion response.
 
     Args:
-        content: Content to check
-        limit: Character limit (default: CHARACTER_LIMIT)
+        response: Parsed API response
+        default: Text to return when the response has no choices or no content
 
     Returns:
-        Original or truncated content with notice
+        Answer text, or default
     """
-    if len(content) <= limit:
-        return content
+    choices = response.get("choices")
+    if not choices:
+        return default
+    message = choices[0].get("message") or {}
+    return message.get("content") or default
 
-    truncated = content[:limit]
-    truncation_notice = f"\n\n[Response truncated at {limit} characters. Original length: {len(content)} characters]"
-    return truncated + truncation_notice
+
+def _tokens_used(response: Dict[str, Any], usage: Dict[str, Any]) -> str:
+    """
+    Format the token count for a response's usage footer.
+
+    Args:
+        response: Parsed API response, as returned by _make_api_request
+        usage: The response's usage block
+
+    Returns:
+        Total tokens, or "0 (cached)" when the response came from the cache
+    """
+    if response.get("cached"):
+        return "0 (cached)"
+    return str(usage.get('total_tokens', 'N/A'))
 
 
-def _format_citations(search_results: Optional[List[Dict[str, Any]]]) -> str:
+def _format_citations(search_results: Sequence[Dict[str, Any]]) -> str:
     """
     Format search result citations into readable markdown.
 
@@ -354,13 +549,10 @@ def _format_citations(search_results: Optional[List[Dict[str, Any]]]) -> str:
     if not search_results:
         return ""
 
-    citations = ["## Sources\n"]
-    for idx, result in enumerate(search_results, 1):
-        url = result.get('url', 'N/A')
-        title = result.get('title', 'Unknown')
-        citations.append(f"{idx}. [{title}]({url})")
-
-    return "\n".join(citations)
+    return "## Sources\n\n" + "\n".join(
+        f"{idx}. [{result.get('title', 'Unknown')}]({result.get('url', 'N/A')})"
+        for idx, result in enumerate(search_results, 1)
+    )
 
 
 # Tool implementations
@@ -416,7 +608,7 @@ async def perplexity_ask(params: PerplexityAskInput) -> str:
     try:
         # Build API payload
         payload = {
-            "model": params.model.value,
+            "model": params.model,
             "messages": [
                 {
                     "role": "user",
@@ -425,7 +617,7 @@ async def perplexity_ask(params: PerplexityAskInput) -> str:
             ],
             "max_tokens": params.max_tokens,
             "temperature": params.temperature,
-            "search_mode": params.search_mode.value if params.search_mode else "web",
+            "search_mode": params.search_mode if params.search_mode else "web",
             "return_images": params.return_images,
             "return_related_questions": params.return_related_questions
         }
@@ -434,38 +626,41 @@ async def perplexity_ask(params: PerplexityAskInput) -> str:
         response = await _make_api_request("/chat/completions", payload)
 
         # Extract response content
-        answer = response.get("choices", [{}])[0].get("message", {}).get("content", "No response generated")
+        answer = _extract_answer(response, "No response generated")
+        search_results = response.get("search_results") or ()
+        related_questions = response.get("related_questions") or ()
+        images = response.get("images") or ()
 
         # Build formatted response
-        result_parts = [f"# Perplexity AI Response\n\n{answer}\n"]
+        buf = _CappedBuffer()
+        buf.write(f"# Perplexity AI Response\n\n{answer}\n")
 
         # Add citations if available and requested
-        if params.return_citations and response.get("search_results"):
-            citations = _format_citations(response.get("search_results"))
+        if params.return_citations and search_results:
+            citations = _format_citations(search_results)
             if citations:
-                result_parts.append(f"\n{citations}\n")
+                buf.write(f"\n\n{citations}\n")
 
         # Add related questions if available and requested
-        if params.return_related_questions and response.get("related_questions"):
-            result_parts.append("\n## Related Questions\n")
-            for question in response.get("related_questions", []):
-                result_parts.append(f"- {question}")
-            result_parts.append("")
+        if params.return_related_questions and related_questions:
+            buf.write("\n\n## Related Questions\n")
+            for question in related_questions:
+                buf.write(f"\n- {question}")
+            buf.write("\n")
 
         # Add image URLs if available and requested
-        if params.return_images and response.get("images"):
-            result_parts.append("\n## Images\n")
-            for img_url in response.get("images", []):
-                result_parts.append(f"- {img_url}")
-            result_parts.append("")
+        if params.return_images and images:
+            buf.write("\n\n## Images\n")
+            for img_url in images:
+                buf.write(f"\n- {img_url}")
+            buf.write("\n")
 
         # Add usage information
-        usage = response.get("usage", {})
+        usage = response.get("usage")
         if usage:
-            result_parts.append(f"\n---\n**Tokens used**: {usage.get('total_tokens', 'N/A')}")
+            buf.write(f"\n\n---\n**Tokens used**: {_tokens_used(response, usage)}")
 
-        result = "\n".join(result_parts)
-        return _truncate_if_needed(result)
+        return buf.getvalue()
 
     except Exception as e:
         return _handle_api_error(e)
@@ -522,16 +717,14 @@ async def perplexity_search(params: PerplexitySearchInput) -> str:
     try:
         # Build API payload with search parameters
         payload = {
-            "model": PerplexityModel.SONAR_PRO.value,  # Use sonar-pro for best search results
+            **_SEARCH_PAYLOAD,
             "messages": [
                 {
                     "role": "user",
                     "content": params.query
                 }
             ],
-            "max_tokens": DEFAULT_MAX_TOKENS,
-            "temperature": 0.2,  # Lower temperature for factual search results
-            "search_mode": params.search_mode.value,
+            "search_mode": params.search_mode,
             "return_images": params.return_images,
             "return_related_questions": params.return_related_questions
         }
@@ -547,43 +740,45 @@ async def perplexity_search(params: PerplexitySearchInput) -> str:
         response = await _make_api_request("/chat/completions", payload)
 
         # Extract search results
-        answer = response.get("choices", [{}])[0].get("message", {}).get("content", "No results found")
+        answer = _extract_answer(response, "No results found")
+        search_results = response.get("search_results") or ()
+        related_questions = response.get("related_questions") or ()
+        images = response.get("images") or ()
 
         # Build formatted response
-        result_parts = [f"# Search Results: \"{params.query}\"\n"]
+        buf = _CappedBuffer()
+        buf.write(f"# Search Results: \"{params.query}\"\n")
 
         # Add search mode and filters info
-        filters_info = [f"**Search Mode**: {params.search_mode.value}"]
+        buf.write(f"\n**Search Mode**: {params.search_mode}")
         if params.search_recency_filter:
-            filters_info.append(f"**Time Filter**: {params.search_recency_filter}")
+            buf.write(f"\n**Time Filter**: {params.search_recency_filter}")
         if params.search_domain_filter:
-            filters_info.append(f"**Domain Filter**: {', '.join(params.search_domain_filter)}")
+            buf.write(f"\n**Domain Filter**: {', '.join(params.search_domain_filter)}")
 
-        result_parts.append("\n".join(filters_info))
-        result_parts.append(f"\n## Results\n\n{answer}\n")
+        buf.write(f"\n\n## Results\n\n{answer}\n")
 
         # Add citations
-        if response.get("search_results"):
-            citations = _format_citations(response.get("search_results"))
+        if search_results:
+            citations = _format_citations(search_results)
             if citations:
-                result_parts.append(f"\n{citations}\n")
+                buf.write(f"\n\n{citations}\n")
 
         # Add related questions
-        if params.return_related_questions and response.get("related_questions"):
-            result_parts.append("\n## Related Searches\n")
-            for question in response.get("related_questions", []):
-                result_parts.append(f"- {question}")
-            result_parts.append("")
+        if params.return_related_questions and related_questions:
+            buf.write("\n\n## Related Searches\n")
+            for question in related_questions:
+                buf.write(f"\n- {question}")
+            buf.write("\n")
 
         # Add images
-        if params.return_images and response.get("images"):
-            result_parts.append("\n## Images\n")
-            for img_url in response.get("images", []):
-                result_parts.append(f"- {img_url}")
-            result_parts.append("")
+        if params.return_images and images:
+            buf.write("\n\n## Images\n")
+            for img_url in images:
+                buf.write(f"\n- {img_url}")
+            buf.write("\n")
 
-        result = "\n".join(result_parts)
-        return _truncate_if_needed(result)
+        return buf.getvalue()
 
     except Exception as e:
         return _handle_api_error(e)
@@ -642,68 +837,68 @@ async def perplexity_research(params: PerplexityResearchInput) -> str:
     try:
         # Build API payload for deep research
         payload = {
-            "model": PerplexityModel.SONAR_DEEP_RESEARCH.value,
+            **_RESEARCH_PAYLOAD,
             "messages": [
                 {
                     "role": "user",
                     "content": params.research_query
                 }
             ],
-            "reasoning_effort": params.reasoning_effort.value,
-            "search_mode": params.search_mode.value,
-            "return_images": params.return_images,
-            "return_related_questions": True,  # Always return for research
-            "max_tokens": 16384,  # Higher limit for comprehensive research
-            "temperature": 0.1  # Low temperature for factual research
+            "reasoning_effort": params.reasoning_effort,
+            "search_mode": params.search_mode,
+            "return_images": params.return_images
         }
 
         # Make API request (may take longer for deep research)
         response = await _make_api_request("/chat/completions", payload)
 
         # Extract research content
-        research_content = response.get("choices", [{}])[0].get("message", {}).get("content", "No research results generated")
+        research_content = _extract_answer(response, "No research results generated")
+        search_results = response.get("search_results") or ()
+        related_questions = response.get("related_questions") or ()
+        images = response.get("images") or ()
 
         # Build formatted response
-        result_parts = [
-            f"# Deep Research Report: {params.research_query}\n",
-            f"**Research Depth**: {params.reasoning_effort.value}",
-            f"**Source Type**: {params.search_mode.value}\n",
-            "---\n",
-            research_content,
-            "\n"
-        ]
+        buf = _CappedBuffer()
+        buf.write(
+            f"# Deep Research Report: {params.research_query}\n\n"
+            f"**Research Depth**: {params.reasoning_effort}\n"
+            f"**Source Type**: {params.search_mode}\n\n"
+            "---\n\n"
+        )
+        buf.write(research_content)
+        buf.write("\n\n")
 
         # Add extensive citations
-        if response.get("search_results"):
-            citations = _format_citations(response.get("search_results"))
+        if search_results:
+            citations = _format_citations(search_results)
             if citations:
-                result_parts.append(f"\n{citations}\n")
+                buf.write(f"\n\n{citations}\n")
 
         # Add related research topics
-        if response.get("related_questions"):
-            result_parts.append("\n## Related Research Topics\n")
-            for question in response.get("related_questions", []):
-                result_parts.append(f"- {question}")
-            result_parts.append("")
+        if related_questions:
+            buf.write("\n\n## Related Research Topics\n")
+            for question in related_questions:
+                buf.write(f"\n- {question}")
+            buf.write("\n")
 
         # Add images/visualizations
-        if params.return_images and response.get("images"):
-            result_parts.append("\n## Visualizations\n")
-            for img_url in response.get("images", []):
-                result_parts.append(f"- {img_url}")
-            result_parts.append("")
+        if params.return_images and images:
+            buf.write("\n\n## Visualizations\n")
+            for img_url in images:
+                buf.write(f"\n- {img_url}")
+            buf.write("\n")
 
         # Add research metadata
-        usage = response.get("usage", {})
+        usage = response.get("usage")
         if usage:
-            result_parts.append(
-                f"\n---\n**Research Metadata**\n"
-                f"- Sources consulted: {len(response.get('search_results', []))}\n"
-                f"- Tokens used: {usage.get('total_tokens', 'N/A')}"
+            buf.write(
+                f"\n\n---\n**Research Metadata**\n"
+                f"- Sources consulted: {len(search_results)}\n"
+                f"- Tokens used: {_tokens_used(response, usage)}"
             )
 
-        result = "\n".join(result_parts)
-        return _truncate_if_needed(result)
+        return buf.getvalue()
 
     except Exception as e:
         return _handle_api_error(e)
@@ -762,49 +957,45 @@ async def perplexity_reason(params: PerplexityReasonInput) -> str:
     try:
         # Build API payload for reasoning
         payload = {
-            "model": params.model.value,
+            **_REASON_PAYLOAD,
+            "model": params.model,
             "messages": [
-                {
-                    "role": "system",
-                    "content": "You are an expert reasoning engine. Analyze problems step-by-step, consider multiple perspectives, and provide clear logical deductions."
-                },
+                _REASON_SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": params.problem
                 }
             ],
-            "temperature": params.temperature,
-            "max_tokens": 8192,  # Higher limit for detailed reasoning
-            "disable_search": True  # Disable web search for pure reasoning
+            "temperature": params.temperature
         }
 
         # Make API request
         response = await _make_api_request("/chat/completions", payload)
 
         # Extract reasoning content
-        reasoning_content = response.get("choices", [{}])[0].get("message", {}).get("content", "No reasoning response generated")
+        reasoning_content = _extract_answer(response, "No reasoning response generated")
 
         # Build formatted response
-        result_parts = [
-            f"# Reasoning Analysis\n",
-            f"**Model**: {params.model.value}",
-            f"**Temperature**: {params.temperature} (0.0 = most logical, 2.0 = most creative)\n",
-            "---\n",
-            reasoning_content,
-            "\n"
-        ]
+        buf = _CappedBuffer()
+        buf.write(
+            f"# Reasoning Analysis\n\n"
+            f"**Model**: {params.model}\n"
+            f"**Temperature**: {params.temperature} (0.0 = most logical, 2.0 = most creative)\n\n"
+            "---\n\n"
+        )
+        buf.write(reasoning_content)
+        buf.write("\n\n")
 
         # Add usage information
-        usage = response.get("usage", {})
+        usage = response.get("usage")
         if usage:
-            result_parts.append(
-                f"\n---\n**Analysis Metadata**\n"
-                f"- Tokens used: {usage.get('total_tokens', 'N/A')}\n"
+            buf.write(
+                f"\n\n---\n**Analysis Metadata**\n"
+                f"- Tokens used: {_tokens_used(response, usage)}\n"
                 f"- Mode: Pure reasoning (web search disabled)"
             )
 
-        result = "\n".join(result_parts)
-        return _truncate_if_needed(result)
+        return buf.getvalue()
 
     except Exception as e:
         return _handle_api_error(e)